@@ -1,11 +1,31 @@
-from .balloontip import CreateBalloontip
+import warnings
+
+# python -m runs driver and history after this package has imported them; their entry points expect that
+warnings.filterwarnings('ignore', rf"'{__name__}\.(driver|history)' found in sys\.modules", RuntimeWarning)
+
+from .balloontip import CreateBalloontip, ProgressBalloontip
+from .driver import Driver
+from .history import History
 from .inputdialog import InputDialog
 from .messagebox import Messagebox
-from .playsound import PlaySound
+from .notificationmanager import NotificationManager
+from .pagedtext import PagedTextView
+from .playsound import PlaySound, SoundScheduler
+from .progressdialog import ProgressDialog, progress
+from .tone import PlayTone
 
 __all__ = [
     'CreateBalloontip',
+    'ProgressBalloontip',
     'Messagebox',
+    'Driver',
+    'History',
     'InputDialog',
-    'PlaySound'
+    'NotificationManager',
+    'PagedTextView',
+    'PlaySound',
+    'SoundScheduler',
+    'PlayTone',
+    'ProgressDialog',
+    'progress'
 ]
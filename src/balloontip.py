@@ -1,21 +1,42 @@
 from sys import executable as py_exe
 from pywintypes import HANDLE
 from re import sub as re_sub
+from collections import Counter
 from pathlib import Path
 import win32gui as gui32
 import win32con as con32
-from time import sleep
+import logging
+
+from threading import (
+    Thread,
+    Event,
+    Lock
+)
+
+from time import (
+    monotonic,
+    sleep
+)
 
 from subprocess import (
     CREATE_NEW_CONSOLE,
     run
 )
 from typing import (
+    Callable,
     Optional as O,
     Union as U
 )
 
+try:
+    from .history import history
+except ImportError:
+    from history import history
+
 py_icon = Path(py_exe).parent.joinpath("DLLs", "py.ico")
+logger = logging.getLogger(__name__)
+
+ErrorPolicy = U[str, Callable[[Exception, str], None]]
 
 
 class CreateBalloontip:
@@ -25,6 +46,15 @@ class CreateBalloontip:
     msg: str
     timeout: U[int, float]
     icon: str
+    onerror: ErrorPolicy = 'log'
+    errors: Counter = Counter()
+    errorInterval: float = 5.0
+    _errLock = Lock()
+    _errLogged: float = float('-inf')
+    _errSuppressed: int = 0
+    _policies = ('log', 'raise', 'ignore', 'console')
+    _added: bool = False
+    _uid: int = 0
     _hinst: int
     _classAtom: int
     _hwnd: int
@@ -32,7 +62,8 @@ class CreateBalloontip:
     _hicon: HANDLE
 
     def __init__(self, title: str, message: str, timeout: U[int, float] = 6,
-                 icon: O[str] = 'default', silent: bool = False):
+                 icon: O[str] = 'default', silent: bool = False,
+                 onerror: O[ErrorPolicy] = None):
         """Creates a popup balloontip on Windows 10
 
         Parameters
@@ -46,12 +77,15 @@ class CreateBalloontip:
         icon (str, optional): [default="default"] The balloontip's icon. One of "default", "info", "warning", "error", or an *.ico image file path
 
         silent (bool, optional): [default=False] Whether to play a sound when the balloontip is displayed
+
+        onerror (str|callable, optional): [default=None] How to report errors (bad icon, bad timeout). One of "log", "raise", "ignore", "console", or a callable(error, action). None uses the class-wide <CreateBalloontip.onerror> ("log")
         """
 
         self.title = title
         self.msg = message
         self.timeout = timeout
         self.icon = icon
+        self._setPolicy(onerror)
         self._run(silent)
 
     def _getIcon(self) -> bool:
@@ -87,8 +121,48 @@ class CreateBalloontip:
             self._infoFlags |= dwInfoFlags.get(str(self.icon).upper(), 0)
         return True
 
+    def _setPolicy(self, onerror: O[ErrorPolicy]) -> None:
+        if onerror is None:
+            return
+        if not callable(onerror) and onerror not in self._policies:
+            raise ValueError('< onerror > parameter must be one of "log", "raise", '
+                             '"ignore", "console", or a callable')
+        self.onerror = onerror
+
+    def _showError(self, err: Exception, txt: str) -> None:
+        """report <err> according to <self.onerror>. <txt> is what the balloontip does next ("continue" or "exit")"""
+
+        with self._errLock:
+            CreateBalloontip.errors[type(err).__name__] += 1
+        policy = self.onerror
+        if callable(policy):
+            policy(err, txt)
+        elif policy == 'raise':
+            raise err
+        elif policy == 'log':
+            self._logError(err, txt)
+        elif policy == 'console':
+            self._consoleError(err, txt)
+
+    @classmethod
+    def _logError(cls, err: Exception, txt: str) -> None:
+        """log <err>, emitting at most one record per <errorInterval> seconds. Errors raised in between are counted and reported with the next record"""
+
+        with cls._errLock:
+            now = monotonic()
+            if now - CreateBalloontip._errLogged < cls.errorInterval:
+                CreateBalloontip._errSuppressed += 1
+                return
+            suppressed = CreateBalloontip._errSuppressed
+            CreateBalloontip._errLogged = now
+            CreateBalloontip._errSuppressed = 0
+        logger.error('Error in %s: %s (will %s)%s', Path(__file__).parent, err, txt,
+                     f'; {suppressed} more since last report' if suppressed else '')
+
     @staticmethod
-    def _showError(msg: str, txt: str) -> None:
+    def _consoleError(msg: Exception, txt: str) -> None:
+        """legacy behaviour: show the error in a new console and block until "Return" is pressed"""
+
         brk = f"`n{'=' * 25}`n"
         msg = re_sub(r'(\"|\')',
                      r'`\1',
@@ -100,11 +174,13 @@ class CreateBalloontip:
             creationflags=CREATE_NEW_CONSOLE)
 
     def _onDestroy(self, *_):
-        nid = (self._hwnd, 0)
-        gui32.Shell_NotifyIcon(gui32.NIM_DELETE, nid)
+        if self._added:
+            nid = (self._hwnd, self._uid)
+            gui32.Shell_NotifyIcon(gui32.NIM_DELETE, nid)
+            self._added = False
         gui32.PostQuitMessage(0)
 
-    def _run(self, silent: bool = False):
+    def _createWindow(self):
         message_map = {con32.WM_DESTROY: self._onDestroy, }
         # register the window class
         wc = gui32.WNDCLASS()
@@ -117,6 +193,16 @@ class CreateBalloontip:
         self._hwnd = gui32.CreateWindow(self._classAtom, 'Taskbar', style, 0, 0, con32.CW_USEDEFAULT,
                                         con32.CW_USEDEFAULT, 0, 0, self._hinst, None)
         gui32.UpdateWindow(self._hwnd)
+
+    def _destroyWindow(self):
+        gui32.DestroyWindow(self._hwnd)
+        gui32.UnregisterClass(self._classAtom, self._hinst)
+
+    def _nid(self, flags: int = gui32.NIF_ICON | gui32.NIF_MESSAGE | gui32.NIF_TIP | gui32.NIF_INFO) -> tuple:
+        return (self._hwnd, self._uid, flags, con32.WM_USER + 20, self._hicon,
+                "Balloontip", self.msg, 200, self.title, self._infoFlags)
+
+    def _run(self, silent: bool = False):
         try:
             timeout = float(self.timeout)
             if timeout <= 0:
@@ -125,21 +211,158 @@ class CreateBalloontip:
         except Exception as e:
             self._showError(e, 'exit')
             return
+        self._createWindow()
+        try:
+            self._infoFlags = gui32.NIIF_NOSOUND if silent else 0
+            if not self._getIcon():
+                return
+            gui32.Shell_NotifyIcon(gui32.NIM_ADD, self._nid())
+            self._added = True
+            history.record('balloontip', self.title, self.msg)
+            sleep(timeout)
+        finally:
+            self._destroyWindow()
+
+
+class ProgressBalloontip(CreateBalloontip):
+    """Keeps a single balloontip icon alive and updates it in place"""
+
+    interval: float
+    updates: int
+    sent: int
+    _pending: tuple[str, str]
+    _shown: tuple[str, str]
+    _stop: Event
+    _worker: Thread
+
+    def __init__(self, title: str, message: str = '', interval: U[int, float] = 1,
+                 icon: O[str] = 'default', silent: bool = True,
+                 onerror: O[ErrorPolicy] = None):
+        """Shows a balloontip that can be updated in place with <update> and is removed with <close>. \
+Updates are coalesced: at most one is shown every <interval> seconds, and the latest one always wins
+
+        Parameters
+        ----------
+        title (str): The text to display at the top of the balloontip
+
+        message (str, optional): [default=""] The text to display as the body of the balloontip
+
+        interval (int|float, optional): [default=1] Minimum seconds between two displayed updates
+
+        icon (str, optional): [default="default"] The balloontip's icon. One of "default", "info", "warning", "error", or an *.ico image file path
+
+        silent (bool, optional): [default=True] Whether to suppress the sound played each time the balloontip is displayed
+
+        onerror (str|callable, optional): [default=None] How to report errors. See <CreateBalloontip>
+        """
+
+        if float(interval) <= 0:
+            raise ValueError("the 'interval' parameter must be greater than 0")
+        self.title = title
+        self.msg = message
+        self.icon = icon
+        self.interval = float(interval)
+        self._setPolicy(onerror)
+        self.updates = self.sent = 0
+        self._pending = self._shown = (title, message)
+        self._stop = Event()
         self._infoFlags = gui32.NIIF_NOSOUND if silent else 0
-        if not self._getIcon():
+        self._createWindow()
+        try:
+            if not self._getIcon():
+                self._destroyWindow()
+                self._stop.set()
+                return
+            gui32.Shell_NotifyIcon(gui32.NIM_ADD, self._nid())
+            self._added = True
+        except BaseException:
+            self._destroyWindow()
+            raise
+        self._worker = Thread(target=self._pump, daemon=True)
+        self._worker.start()
+
+    def __enter__(self) -> 'ProgressBalloontip':
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._stop.is_set()
+
+    def update(self, message: O[str] = None, title: O[str] = None) -> None:
+        """-----
+        Set the balloontip's text. This only records the new text, so it is cheap enough to call from a tight loop
+
+        Parameters
+        ----------
+        message (str, optional): [default=None] The new body text. None keeps the current one
+
+        title (str, optional): [default=None] The new title. None keeps the current one
+        """
+
+        self.updates += 1
+        title_, message_ = self._pending
+        self._pending = (title_ if title is None else title,
+                         message_ if message is None else message)
+
+    def close(self, summary: O[str] = None, title: O[str] = None, timeout: U[int, float] = 6) -> None:
+        """-----
+        Show a final summary and remove the icon
+
+        Parameters
+        ----------
+        summary (str, optional): [default=None] The final body text. None keeps the latest update
+
+        title (str, optional): [default=None] The final title. None keeps the latest update
+
+        timeout (int|float, optional): [default=6] Seconds to keep the summary displayed before removing the icon
+        """
+
+        if self.closed:
             return
-        flags = gui32.NIF_ICON | gui32.NIF_MESSAGE | gui32.NIF_TIP | gui32.NIF_INFO
-        nid = (self._hwnd, 0, flags, con32.WM_USER + 20, self._hicon,
-               "Balloontip", self.msg, 200, self.title, self._infoFlags)
-        gui32.Shell_NotifyIcon(gui32.NIM_ADD, nid)
-        sleep(timeout)
-        gui32.DestroyWindow(self._hwnd)
-        gui32.UnregisterClass(self._classAtom, self._hinst)
+        self._stop.set()
+        self._worker.join()
+        self.update(summary, title)
+        try:
+            shown = self._flush()
+            history.record('balloontip', self.title, self.msg)
+            if shown:
+                sleep(max(float(timeout), 0))
+        finally:
+            self._destroyWindow()
+
+    def _flush(self) -> bool:
+        """send the pending text with NIM_MODIFY if it changed since the last call"""
+
+        pending = self._pending
+        if pending == self._shown:
+            return False
+        self._shown = pending
+        self.title, self.msg = pending
+        gui32.Shell_NotifyIcon(gui32.NIM_MODIFY, self._nid(gui32.NIF_TIP | gui32.NIF_INFO))
+        self.sent += 1
+        return True
+
+    def _pump(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self._flush()
+            except Exception as e:
+                self._showError(e, 'continue')
 
 
 def test():
     CreateBalloontip(title="Test Tip",
                      message="This is a test balloontip")
+    total = 100_000
+    with ProgressBalloontip("Progress Test", f"0/{total}") as prog:
+        for i in range(1, total + 1):
+            if not i % 1000:
+                sleep(0.01)
+            prog.update(f"{i}/{total}")
+        prog.close(f"Finished {total} steps ({prog.sent} updates shown)")
 
 
 if __name__ == '__main__':
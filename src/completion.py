@@ -0,0 +1,204 @@
+from concurrent.futures import Future
+from collections import OrderedDict
+from inspect import iscoroutinefunction
+from threading import Lock
+from bisect import bisect_left
+import asyncio
+
+from PyQt5.QtCore import (
+    QStringListModel,
+    pyqtSignal,
+    QObject,
+    QTimer,
+    Qt
+)
+from PyQt5.QtWidgets import (
+    QCompleter,
+    QLineEdit
+)
+from typing import (
+    Awaitable,
+    Callable,
+    Iterable,
+    Optional as O,
+    Union as U
+)
+
+try:
+    from .validation import executor
+except ImportError:
+    from validation import executor
+
+Source = U[Iterable[str], Callable[[str], Iterable[str]], Callable[[str], Awaitable[Iterable[str]]]]
+
+
+class CompletionProvider:
+    """-----
+    Looks up completions for a prefix from a static list, a callable, or a coroutine function
+
+    Results are kept in a bounded LRU cache keyed by prefix. When a shorter prefix's results are cached and complete, \
+a longer prefix is answered by filtering them instead of querying the source again. Results are complete when the \
+static list had at most <limit> matches, or when a callable source returned fewer than <limit>: a source that \
+returns exactly <limit> may have cut its own results short
+    """
+
+    source: Source
+    limit: int
+    cacheSize: int
+    narrow: bool
+    _cache: OrderedDict
+    _keys: O[list[str]] = None
+    _items: O[list[str]] = None
+
+    def __init__(self, source: Source, limit: int = 50, cacheSize: int = 256, narrow: bool = True):
+        """-----
+        Parameters
+        ----------
+        source (Iterable[str] | callable): a list of completions, or a callable / coroutine function taking the typed text and returning completions
+
+        limit (int, optional): [default=50] the maximum number of completions to show
+
+        cacheSize (int, optional): [default=256] the number of prefixes to cache
+
+        narrow (bool, optional): [default=True] answer longer prefixes by filtering a shorter prefix's cached results. \
+Disable this if the source does not match by (case-insensitive) prefix
+        """
+
+        self.limit = limit
+        self.cacheSize = cacheSize
+        self.narrow = narrow
+        self._cache = OrderedDict()
+        self._lock = Lock()
+        if callable(source):
+            self.source = source
+        else:
+            self._items = sorted(set(source), key=str.casefold)
+            self._keys = [item.casefold() for item in self._items]
+            self.source = self._lookup
+
+    @property
+    def threaded(self) -> bool:
+        """whether queries should run off the GUI thread. Static lists are searched in O(log n) and are not"""
+        return self._items is None
+
+    def _lookup(self, prefix: str) -> list[str]:
+        key = prefix.casefold()
+        i = bisect_left(self._keys, key)
+        out = list()
+        for item, k in zip(self._items[i:i + self.limit + 1], self._keys[i:i + self.limit + 1]):
+            if not k.startswith(key):
+                break
+            out.append(item)
+        return out
+
+    def cached(self, prefix: str) -> O[list[str]]:
+        """the completions for <prefix> if they can be answered from the cache, otherwise None"""
+
+        with self._lock:
+            cache = self._cache
+            hit = cache.get(prefix)
+            if hit is not None:
+                cache.move_to_end(prefix)
+                return hit[0]
+            if not self.narrow:
+                return None
+            key = prefix.casefold()
+            for n in range(len(prefix) - 1, -1, -1):
+                hit = cache.get(prefix[:n])
+                if hit is not None and hit[1]:
+                    results = [item for item in hit[0] if item.casefold().startswith(key)]
+                    self._storeLocked(prefix, results, True)
+                    return results
+        return None
+
+    def query(self, prefix: str) -> list[str]:
+        """the completions for <prefix>, querying the source on a cache miss. Safe to call from any thread"""
+
+        results = self.cached(prefix)
+        if results is not None:
+            return results
+        if iscoroutinefunction(self.source):
+            results = asyncio.run(self.source(prefix))
+        else:
+            results = self.source(prefix)
+        results = list(results or ())
+        # <_lookup> fetches one more than <limit> to tell; any other source may cap its results at <limit>
+        complete = len(results) <= self.limit if self._items is not None else len(results) < self.limit
+        results = [str(item) for item in results[:self.limit]]
+        self._store(prefix, results, complete)
+        return results
+
+    def _store(self, prefix: str, results: list[str], complete: bool):
+        with self._lock:
+            self._storeLocked(prefix, results, complete)
+
+    def _storeLocked(self, prefix: str, results: list[str], complete: bool):
+        self._cache[prefix] = (results, complete)
+        self._cache.move_to_end(prefix)
+        while len(self._cache) > self.cacheSize:
+            self._cache.popitem(last=False)
+
+
+class AsyncCompleter(QObject):
+    """-----
+    Shows completions from a <CompletionProvider> in a QLineEdit's popup
+
+    Static lists and cached prefixes are answered immediately. Other prefixes are queried <delay> ms after the last keystroke in a thread pool; \
+a newer keystroke cancels queries that have not started and discards the results of those that have
+    """
+
+    provider: CompletionProvider
+    _found = pyqtSignal(int, object)
+    _future: O[Future] = None
+    _generation: int = 0
+
+    def __init__(self, lineEdit: QLineEdit, provider: U[CompletionProvider, Source], delay: int = 150):
+        super().__init__(lineEdit)
+        self.provider = provider if isinstance(provider, CompletionProvider) else CompletionProvider(provider)
+        self._lineEdit = lineEdit
+        self._model = QStringListModel(self)
+        self.completer = QCompleter(self._model, lineEdit)
+        self.completer.setCaseSensitivity(Qt.CaseInsensitive)
+        self.completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.completer.setMaxVisibleItems(12)
+        lineEdit.setCompleter(self.completer)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay)
+        self._timer.timeout.connect(self._query)
+        self._found.connect(self._show)
+        lineEdit.textEdited.connect(self._edited)
+
+    def _edited(self, text: str):
+        self._generation += 1
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+        if not text:
+            results = list()
+        elif self.provider.threaded:
+            results = self.provider.cached(text)
+        else:
+            results = self.provider.query(text)
+        if results is not None:
+            self._timer.stop()
+            self._show(self._generation, results)
+        else:
+            self._timer.start()
+
+    def _query(self):
+        text = self._lineEdit.text()
+        gen = self._generation
+        self._future = executor().submit(self.provider.query, text)
+        self._future.add_done_callback(
+            lambda f: f.cancelled() or f.exception() is not None or self._found.emit(gen, f.result()))
+
+    def _show(self, gen: int, results: list[str]):
+        if gen != self._generation:
+            return
+        self._future = None
+        self._model.setStringList(results)
+        if results and self._lineEdit.hasFocus():
+            self.completer.complete()
+        else:
+            self.completer.popup().hide()
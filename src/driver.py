@@ -0,0 +1,201 @@
+from collections import defaultdict
+from importlib import import_module
+from pathlib import Path
+import json
+import sys
+
+from time import (
+    monotonic,
+    sleep
+)
+from typing import (
+    Any,
+    Callable,
+    Optional as O,
+    Union as U
+)
+
+VERSION = 1
+
+
+class ReplayError(RuntimeError):
+    """the dialogs being shown do not match the trace being replayed"""
+
+
+class Driver:
+    """-----
+    Records Messagebox and InputDialog sessions to a trace file, or replays them without a user
+
+    A trace is a JSON-lines file with one entry per dialog: its kind, its spec (title, message, buttons or fields), \
+the user's answer and the think time. When replaying, each dialog is built as usual but never shown: after the \
+recorded think time (divided by <speed>) the answer is given through the dialog's own _btnclick / _submit path. \
+To replay without a display, set QT_QPA_PLATFORM=offscreen in the environment before starting Python: importing \
+winnotify creates the QApplication, so setting it later has no effect
+
+
+    Attributes
+    ----------
+    stats (dict[str, float]): dialogs handled, and seconds spent building them, waiting for answers and overall
+    """
+
+    active: O['Driver'] = None
+    mode: str
+    path: Path
+    speed: O[float]
+    strict: bool
+    stats: dict[str, float]
+
+    def __init__(self, mode: str, path: U[str, Path], speed: O[float] = 1.0, strict: bool = True):
+        """-----
+        Parameters
+        ----------
+        mode (str): One of "record" or "replay"
+
+        path (str | Path): the trace file
+
+        speed (float, optional): [default=1.0] replay think times this many times faster. None replays at maximum speed
+
+        strict (bool, optional): [default=True] raise a ReplayError if a dialog's kind or title does not match the trace, or a recorded answer fails validation
+        """
+
+        if mode not in ('record', 'replay'):
+            raise ValueError('< mode > parameter must be one of "record" or "replay"')
+        self.mode = mode
+        self.path = Path(path)
+        self.speed = speed
+        self.strict = strict
+        self.stats = defaultdict(float)
+        self._file = None
+        self._entries: list[dict[str, Any]] = list()
+        self._cursor = 0
+        self._previous: O[Driver] = None
+        self._started = 0.0
+
+    @classmethod
+    def record(cls, path: U[str, Path]) -> 'Driver':
+        """a Driver recording to <path>. Use it as a context manager"""
+        return cls('record', path)
+
+    @classmethod
+    def replay(cls, path: U[str, Path], speed: O[float] = 1.0, strict: bool = True) -> 'Driver':
+        """a Driver replaying <path>. Use it as a context manager"""
+        return cls('replay', path, speed, strict)
+
+    def __enter__(self) -> 'Driver':
+        if self.mode == 'record':
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._write(dict(version=VERSION))
+        else:
+            with open(self.path, encoding='utf-8') as f:
+                lines = [json.loads(line) for line in f if line.strip()]
+            if not lines or lines[0].get('version') != VERSION:
+                raise ReplayError(f'{self.path} is not a version {VERSION} trace')
+            self._entries = lines[1:]
+            self._cursor = 0
+        self._previous, Driver.active = Driver.active, self
+        self._started = monotonic()
+        return self
+
+    def __exit__(self, *_):
+        self.stats['total'] += monotonic() - self._started
+        Driver.active = self._previous
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @property
+    def remaining(self) -> int:
+        """the number of trace entries not replayed yet"""
+        return len(self._entries) - self._cursor
+
+    def rewind(self) -> None:
+        """replay the trace again from the start"""
+        self._cursor = 0
+
+    def _write(self, entry: dict[str, Any]):
+        self._file.write(json.dumps(entry, default=str) + '\n')
+        self._file.flush()
+
+    def handle(self, dialog: Any, kind: str, spec: dict[str, Any], execute: Callable[[], Any], started: float):
+        built = monotonic()
+        self.stats['dialogs'] += 1
+        self.stats['build'] += built - started
+        if self.mode == 'record':
+            execute()
+            think = monotonic() - built
+            self.stats['think'] += think
+            answer = dialog.out
+            if isinstance(answer, dict):
+                answer = {str(k): v for k, v in answer.items()} or None
+            self._write(dict(kind=kind, spec=spec, answer=answer, think=round(think, 3)))
+            return
+        if self._cursor >= len(self._entries):
+            raise ReplayError(f'the trace has no entry for {kind} {spec.get("title")!r}')
+        entry = self._entries[self._cursor]
+        self._cursor += 1
+        if self.strict and (entry['kind'] != kind or entry['spec'].get('title') != spec.get('title')):
+            raise ReplayError(f'expected {entry["kind"]} {entry["spec"].get("title")!r}, '
+                              f'got {kind} {spec.get("title")!r}')
+        if self.speed:
+            wait = entry.get('think', 0) / self.speed
+            sleep(wait)
+            self.stats['think'] += wait
+        dialog._replay(entry['answer'])
+
+    def report(self) -> str:
+        """a summary of <stats>"""
+
+        n = int(self.stats['dialogs'])
+        total = self.stats['total'] or monotonic() - self._started
+        return (f'{n} dialogs in {total:.3f} s ({n / total if total else 0:,.1f}/s); '
+                f'building {1000 * self.stats["build"] / max(n, 1):.2f} ms per dialog, '
+                f'think time {self.stats["think"]:.3f} s')
+
+
+def runDialog(dialog: Any, kind: str, spec: dict[str, Any], execute: Callable[[], Any], started: float) -> None:
+    """show <dialog> with <execute>, unless a <Driver> is active"""
+
+    driver = Driver.active
+    if driver is None:
+        execute()
+    else:
+        driver.handle(dialog, kind, spec, execute, started)
+
+
+def main(argv: O[list[str]] = None) -> None:
+    from argparse import ArgumentParser, REMAINDER
+    import runpy
+
+    parser = ArgumentParser(prog='python -m winnotify.src.driver',
+                            description='Record dialog-driven scripts, or replay them without a user',
+                            epilog='To replay without a display, run with the environment variable '
+                                   'QT_QPA_PLATFORM=offscreen')
+    parser.add_argument('mode', choices=('record', 'replay'))
+    parser.add_argument('trace', type=Path, help='the trace file')
+    parser.add_argument('script', type=Path, help='the script to run')
+    parser.add_argument('args', nargs=REMAINDER, help="the script's arguments")
+    parser.add_argument('--speed', default='1',
+                        help='replay think times this many times faster, or "max" (default: 1)')
+    parser.add_argument('--repeat', type=int, default=1, help='replay the script this many times (default: 1)')
+    args = parser.parse_args(argv)
+
+    sys.argv = [str(args.script), *args.args]
+    if args.mode == 'record':
+        driver = Driver.record(args.trace)
+        with driver:
+            runpy.run_path(str(args.script), run_name='__main__')
+    else:
+        speed = None if args.speed == 'max' else float(args.speed)
+        driver = Driver.replay(args.trace, speed)
+        with driver:
+            for _ in range(args.repeat):
+                driver.rewind()
+                runpy.run_path(str(args.script), run_name='__main__')
+                if driver.remaining:
+                    raise ReplayError(f'{driver.remaining} trace entries were not replayed')
+    print(driver.report(), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    # Messagebox and InputDialog check <Driver.active> in the imported copy of this module, not in __main__
+    import_module(__spec__.name if __spec__ else 'driver').main()
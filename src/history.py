@@ -0,0 +1,547 @@
+from collections import OrderedDict, deque
+from queue import Queue, Empty
+from threading import Thread, Lock
+from datetime import datetime
+from struct import Struct
+from pathlib import Path
+from bisect import bisect_left
+import logging
+import json
+import mmap
+import os
+
+from time import (
+    sleep,
+    time
+)
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Iterable,
+    NamedTuple,
+    Optional as O,
+    Union as U
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+    import fcntl
+
+MAGIC = b'WNHIST1\0'
+KINDS = ('balloontip', 'messagebox', 'inputdialog', 'notification')
+DEFAULT_DIR = Path(os.environ.get('LOCALAPPDATA') or Path.home()).joinpath('winnotify')
+
+_RECORD = Struct('<dIQQQ4x')
+"""time, kind, title id, message id, answer id. A string id is its offset in the strings file, 0 for None"""
+_LENGTH = Struct('<I')
+
+logger = logging.getLogger(__name__)
+
+
+class Entry(NamedTuple):
+    time: float
+    kind: str
+    title: O[str]
+    message: O[str]
+    answer: O[str]
+
+    def __str__(self) -> str:
+        when = datetime.fromtimestamp(self.time).isoformat(' ', 'seconds')
+        text = f'{when}  {self.kind:<12} {self.title!r}'
+        if self.message:
+            text += f'  {self.message[:60]!r}'
+        if self.answer is not None:
+            text += f'  -> {self.answer}'
+        return text
+
+
+def _jsonable(value: Any) -> Any:
+    # JSON objects only have str keys, and answers can be keyed by e.g. (QWidget, QWidget)
+    if isinstance(value, dict):
+        return {k if isinstance(k, str) else str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return value
+
+
+def _text(value: Any) -> O[str]:
+    if value is None or isinstance(value, str):
+        return value
+    try:
+        return json.dumps(_jsonable(value), default=str)
+    except (TypeError, ValueError, RecursionError):
+        return str(value)
+
+
+class HistoryReader:
+    """-----
+    Memory-mapped, read-only view of a history directory
+
+    Records are fixed-size and appended in time order, so time ranges are found by binary search. Titles are \
+matched against the (interned, much smaller) strings file first, then records are filtered by string id
+    """
+
+    count: int
+
+    def __init__(self, directory: U[str, Path] = DEFAULT_DIR):
+        directory = Path(directory)
+        self._records = self._map(directory.joinpath('history.rec'))
+        self._strings = self._map(directory.joinpath('history.str'))
+        self.count = max(0, (len(self._records) - len(MAGIC)) // _RECORD.size)
+
+    @staticmethod
+    def _map(path: Path) -> U[mmap.mmap, bytes]:
+        if not path.exists() or path.stat().st_size <= len(MAGIC):
+            return b''
+        with open(path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f'{path} is not a winnotify history file')
+        return mm
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _record(self, i: int) -> tuple:
+        return _RECORD.unpack_from(self._records, len(MAGIC) + i * _RECORD.size)
+
+    def _string(self, sid: int) -> O[str]:
+        if not sid:
+            return None
+        n, = _LENGTH.unpack_from(self._strings, sid)
+        return bytes(self._strings[sid + 4:sid + 4 + n]).decode('utf-8', 'replace')
+
+    def _entry(self, rec: tuple) -> Entry:
+        t, kind, title, message, answer = rec
+        return Entry(t, KINDS[kind] if kind < len(KINDS) else str(kind),
+                     self._string(title), self._string(message), self._string(answer))
+
+    def _index(self, t: float) -> int:
+        return bisect_left(_Times(self), t)
+
+    def _titleIds(self, title: str, contains: bool, candidates: Iterable[int] = ()) -> set[int]:
+        """ids of the strings equal to <title>, or of the <candidates> containing it"""
+
+        buf = self._strings
+        if not contains:
+            needle = title.encode()
+            needle = _LENGTH.pack(len(needle)) + needle
+            ids = set()
+            i = buf.find(needle, len(MAGIC)) if buf else -1
+            while i >= 0:
+                ids.add(i)
+                i = buf.find(needle, i + 1)
+            return ids
+        # only the titles in range are decoded, not the whole strings file (which is mostly messages)
+        hasTitle = self._containing(title)
+        return {sid for sid in candidates if hasTitle(sid)}
+
+    def _containing(self, title: str) -> Callable[[int], bool]:
+        """whether a string id's string contains <title>, case-insensitively, decoding each string once"""
+
+        needle = title.casefold()
+        seen: dict[int, bool] = dict()
+
+        def hasTitle(sid: int) -> bool:
+            hit = seen.get(sid)
+            if hit is None:
+                hit = seen[sid] = bool(sid) and needle in self._string(sid).casefold()
+            return hit
+        return hasTitle
+
+    def _scanBack(self, indices: Iterable[int], match: Callable[[tuple], bool], limit: int) -> list[tuple]:
+        """the first <limit> matching records of <indices> (newest first), returned oldest first"""
+
+        found = list()
+        for i in indices:
+            rec = self._record(i)
+            if match(rec):
+                found.append(rec)
+                if len(found) >= limit:
+                    break
+        found.reverse()
+        return found
+
+    def query(self, start: O[float] = None, end: O[float] = None, title: O[str] = None,
+              contains: bool = False, kind: O[str] = None, limit: O[int] = None) -> list[Entry]:
+        """-----
+        Find entries, oldest first
+
+        Parameters
+        ----------
+        start (float, optional): [default=None] the earliest time (a timestamp) to include
+
+        end (float, optional): [default=None] the time (a timestamp) to stop before
+
+        title (str, optional): [default=None] only include entries with this title
+
+        contains (bool, optional): [default=False] match <title> as a case-insensitive substring
+
+        kind (str, optional): [default=None] only include entries of this kind. One of "balloontip", "messagebox", "inputdialog", "notification"
+
+        limit (int, optional): [default=None] return at most this many of the newest matches
+
+
+        Returns:
+        --------
+        list[Entry] : the matching entries
+        """
+
+        lo = 0 if start is None else self._index(start)
+        hi = self.count if end is None else self._index(end)
+        if lo >= hi or limit == 0:
+            return list()
+        kindId = None if kind is None else KINDS.index(kind)
+        # <limit> is applied before any string is decoded: the newest rows are found first, and a <contains>
+        # search with a <limit> only decodes titles until it has enough matches
+        scan = contains and title is not None and limit is not None
+        if np is not None:
+            recs = np.frombuffer(self._records, dtype=_DTYPE, count=hi - lo,
+                                 offset=len(MAGIC) + lo * _RECORD.size)
+            mask = np.ones(len(recs), dtype=bool)
+            if title is not None and not scan:
+                ids = self._titleIds(title, contains, set(recs['title'].tolist()) if contains else ())
+                if not ids:
+                    return list()
+                mask &= np.isin(recs['title'], np.fromiter(ids, dtype='<u8', count=len(ids)))
+            if kindId is not None:
+                mask &= recs['kind'] == kindId
+            rows = np.flatnonzero(mask)
+            if scan:
+                hasTitle = self._containing(title)
+                found = self._scanBack((lo + int(i) for i in rows[::-1]), lambda rec: hasTitle(rec[2]), limit)
+            else:
+                found = [self._record(lo + int(i)) for i in (rows if limit is None else rows[-limit:])]
+            return [self._entry(rec) for rec in found]
+        view = memoryview(self._records)[len(MAGIC) + lo * _RECORD.size:len(MAGIC) + hi * _RECORD.size]
+        ids = None
+        if title is not None and not scan:
+            ids = self._titleIds(title, contains, {rec[2] for rec in _RECORD.iter_unpack(view)} if contains else ())
+            if not ids:
+                return list()
+        hasTitle = self._containing(title) if scan else lambda sid: ids is None or sid in ids
+
+        def match(rec: tuple) -> bool:
+            return (kindId is None or rec[1] == kindId) and hasTitle(rec[2])
+
+        if limit is None:
+            found = [rec for rec in _RECORD.iter_unpack(view) if match(rec)]
+        else:
+            found = self._scanBack(range(hi - 1, lo - 1, -1), match, limit)
+        return [self._entry(rec) for rec in found]
+
+    def tail(self, n: int = 20) -> list[Entry]:
+        """the newest <n> entries, oldest first"""
+        return [self._entry(self._record(i)) for i in range(max(0, self.count - n), self.count)]
+
+
+if np is not None:
+    _DTYPE = np.dtype([('time', '<f8'), ('kind', '<u4'), ('title', '<u8'),
+                       ('message', '<u8'), ('answer', '<u8'), ('pad', 'V4')])
+
+
+class _Times:
+    """the records' times as a sequence, for bisect"""
+
+    def __init__(self, reader: HistoryReader):
+        self._reader = reader
+
+    def __len__(self) -> int:
+        return self._reader.count
+
+    def __getitem__(self, i: int) -> float:
+        return self._reader._record(i)[0]
+
+
+class _DirectoryLock:
+    """an exclusive lock on a history directory, held by a writer while it appends, so that several processes can \
+share one directory"""
+
+    def __init__(self, directory: Path):
+        self._file = open(directory.joinpath('history.lock'), 'a+b')
+
+    def __enter__(self):
+        fd = self._file.fileno()
+        if msvcrt is None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            return self
+        self._file.seek(0)
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                return self
+            except OSError:
+                # LK_LOCK gives up after 10 attempts, one second apart
+                pass
+
+    def __exit__(self, *exc):
+        fd = self._file.fileno()
+        if msvcrt is None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+    def close(self):
+        self._file.close()
+
+
+class History:
+    """-----
+    Records what was shown to the user and what they answered
+
+    The newest <ringSize> entries are always kept in memory in <recent>. After <open>, entries are also appended to \
+a compact binary store by a background thread, so <record> never blocks the notifying thread. Use <reader> or the \
+command line (python -m winnotify.src.history) to search it
+    """
+
+    recent: deque
+    directory: O[Path] = None
+    internSize: int = 4096
+    _queue: O[Queue] = None
+    _writer: O[Thread] = None
+
+    def __init__(self, directory: U[str, Path, None] = None, ringSize: int = 1000):
+        """-----
+        Parameters
+        ----------
+        directory (str | Path, optional): [default=None] where to store the history. None keeps it in memory only
+
+        ringSize (int, optional): [default=1000] the number of entries kept in <recent>
+        """
+
+        self.recent = deque(maxlen=ringSize)
+        self._lock = Lock()
+        if directory is not None:
+            self.open(directory)
+
+    def open(self, directory: U[str, Path] = DEFAULT_DIR) -> None:
+        """start appending entries to the store in <directory>"""
+
+        with self._lock:
+            if self._writer is not None:
+                self._stop()
+            self.directory = Path(directory)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._queue = Queue()
+            self._writer = Thread(target=self._write, args=(self.directory, self._queue), daemon=True)
+            self._writer.start()
+
+    def close(self) -> None:
+        """write all pending entries and stop appending to the store"""
+
+        with self._lock:
+            self._stop()
+
+    def _stop(self):
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+        self._queue = self._writer = self.directory = None
+
+    def flush(self) -> None:
+        """wait until all recorded entries are written"""
+
+        queue = self._queue
+        if queue is not None:
+            queue.join()
+
+    def record(self, kind: str, title: Any, message: Any = None, answer: Any = None) -> O[Entry]:
+        """-----
+        Record a notification or dialog
+
+        Parameters
+        ----------
+        kind (str): One of "balloontip", "messagebox", "inputdialog", "notification"
+
+        title (Any): the title shown
+
+        message (Any, optional): [default=None] the message shown
+
+        answer (Any, optional): [default=None] the user's answer. Values other than str are stored as JSON
+
+
+        Returns:
+        --------
+        Entry : the recorded entry, or None if it could not be recorded. Recording never raises
+        """
+
+        try:
+            entry = Entry(time(), kind, _text(title), _text(message), _text(answer))
+            self.recent.append(entry)
+            queue = self._queue
+            if queue is not None:
+                queue.put(entry)
+            return entry
+        except Exception:
+            logger.exception('Error in %s', Path(__file__).parent)
+            return None
+
+    def reader(self) -> HistoryReader:
+        """a reader over everything written so far"""
+
+        if self.directory is None:
+            raise RuntimeError('the history is not stored; call History.open first')
+        self.flush()
+        return HistoryReader(self.directory)
+
+    def _write(self, directory: Path, queue: Queue):
+        # after an error (disk full, directory gone, ...) entries are still taken off <queue> and marked done,
+        # so that flush() and reader() return and the queue does not grow, but nothing more is written
+        failed = False
+        files = list()
+        try:
+            lock = _DirectoryLock(directory)
+            files.append(lock)
+            recs = open(directory.joinpath('history.rec'), 'a+b')
+            files.append(recs)
+            strs = open(directory.joinpath('history.str'), 'ab')
+            files.append(strs)
+            with lock:
+                for f in (recs, strs):
+                    if not f.seek(0, 2):
+                        f.write(MAGIC)
+                        f.flush()
+        except Exception:
+            logger.exception('Error in %s: the history is not written to %s', Path(__file__).parent, directory)
+            failed = True
+        interned: OrderedDict[str, int] = OrderedDict()
+
+        def intern(value: O[str]) -> int:
+            if value is None:
+                return 0
+            sid = interned.get(value)
+            if sid is None:
+                data = value.encode('utf-8', 'replace')
+                sid = strs.tell()
+                strs.write(_LENGTH.pack(len(data)) + data)
+                interned[value] = sid
+                if len(interned) > self.internSize:
+                    interned.popitem(last=False)
+            else:
+                interned.move_to_end(value)
+            return sid
+
+        try:
+            while True:
+                batch = [queue.get()]
+                try:
+                    while len(batch) < 512:
+                        batch.append(queue.get_nowait())
+                except Empty:
+                    pass
+                try:
+                    if not failed:
+                        # other processes may append to the same files, so a batch is written under <lock>,
+                        # with string ids and the last record's time taken from the files themselves
+                        with lock:
+                            self._writeBatch([entry for entry in batch if entry is not None], recs, strs, intern)
+                except Exception:
+                    logger.exception('Error in %s: stopped writing the history to %s', Path(__file__).parent,
+                                     directory)
+                    failed = True
+                finally:
+                    for _ in batch:
+                        queue.task_done()
+                if None in batch:
+                    return
+        finally:
+            for f in files:
+                f.close()
+
+    @staticmethod
+    def _writeBatch(batch: list[Entry], recs: BinaryIO, strs: BinaryIO, intern: Callable[[O[str]], int]):
+        # drop a partial record left by an interrupted write
+        size = recs.seek(0, 2)
+        whole = len(MAGIC) + (size - len(MAGIC)) // _RECORD.size * _RECORD.size
+        if whole != size:
+            recs.truncate(whole)
+        last = 0.0
+        if whole > len(MAGIC):
+            recs.seek(whole - _RECORD.size)
+            last = _RECORD.unpack(recs.read(_RECORD.size))[0]
+        strs.seek(0, 2)
+        rows = list()
+        for entry in batch:
+            # <HistoryReader> bisects on time, so never write a record older than the last one
+            last = max(last, entry.time)
+            kind = KINDS.index(entry.kind) if entry.kind in KINDS else len(KINDS)
+            rows.append(_RECORD.pack(last, kind, intern(entry.title), intern(entry.message), intern(entry.answer)))
+        # strings first, so a record never refers to a string that is not on disk
+        strs.flush()
+        recs.write(b''.join(rows))
+        recs.flush()
+
+
+history = History()
+"""the history shared by CreateBalloontip, NotificationManager, Messagebox and InputDialog"""
+
+
+def _parseTime(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def main(argv: O[list[str]] = None) -> None:
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(prog='python -m winnotify.src.history',
+                            description='Tail and search the winnotify notification history')
+    parser.add_argument('-d', '--directory', type=Path, default=DEFAULT_DIR,
+                        help=f'the history directory (default: {DEFAULT_DIR})')
+    sub = parser.add_subparsers(dest='command', required=True)
+    tail = sub.add_parser('tail', help='show the newest entries')
+    tail.add_argument('-n', type=int, default=20, help='the number of entries to show (default: 20)')
+    tail.add_argument('-f', '--follow', action='store_true', help='keep showing new entries')
+    search = sub.add_parser('search', help='search entries')
+    search.add_argument('title', nargs='?', help='the title to look for')
+    search.add_argument('-c', '--contains', action='store_true', help='match the title as a case-insensitive substring')
+    search.add_argument('-k', '--kind', choices=KINDS, help='only show entries of this kind')
+    search.add_argument('-s', '--since', type=_parseTime, help='an ISO date/time or timestamp to start at')
+    search.add_argument('-u', '--until', type=_parseTime, help='an ISO date/time or timestamp to stop before')
+    search.add_argument('-n', type=int, default=None, help='show at most this many of the newest matches')
+    args = parser.parse_args(argv)
+
+    reader = HistoryReader(args.directory)
+    if args.command == 'search':
+        entries = reader.query(args.since, args.until, args.title, args.contains, args.kind, args.n)
+        for entry in entries:
+            print(entry)
+        return
+    for entry in reader.tail(args.n):
+        print(entry)
+    seen = reader.count
+    while args.follow:
+        sleep(1)
+        reader = HistoryReader(args.directory)
+        for i in range(seen, reader.count):
+            print(reader._entry(reader._record(i)), flush=True)
+        seen = reader.count
+
+
+def test():
+    from tempfile import TemporaryDirectory
+
+    with TemporaryDirectory() as tmp:
+        hist = History(tmp)
+        for i in range(10_000):
+            hist.record('messagebox' if i % 2 else 'balloontip', f'Job {i % 7}', f'step {i}', 'ok' if i % 2 else None)
+        reader = hist.reader()
+        print(len(reader), 'entries;', len(reader.query(title='Job 3')), 'titled "Job 3"')
+        for entry in reader.tail(3):
+            print(entry)
+        hist.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -18,11 +18,20 @@ from PyQt5.QtWidgets import (
     QLabel
 )
 from typing import Optional as O, Union as U
+from time import monotonic
 
 try:
     from .playsound import PlaySound
+    from .validation import FormValidator, Rule, Validate, Validator, setWidgetValue, widgetValue
+    from .completion import AsyncCompleter, CompletionProvider, Source
+    from .history import history
+    from .driver import Driver, ReplayError, runDialog
 except ImportError:
     from playsound import PlaySound
+    from validation import FormValidator, Rule, Validate, Validator, setWidgetValue, widgetValue
+    from completion import AsyncCompleter, CompletionProvider, Source
+    from history import history
+    from driver import Driver, ReplayError, runDialog
 
 
 class InputDialog:
@@ -40,9 +49,11 @@ class InputDialog:
     spininput: Asks the user to choose an integer or float and returns the response
 
 
-    Builder Class
+    Builder Classes
     ----------
     ChildWidget|ChWgt: Create a child widget for use with above methods. One of <checkbox>, <combobox>, <spinbox>, or <textbox>
+
+    Validate: Create a validator for use with the <validators> and <rules> parameters. One of <regex>, <range>, <check>, or <rule>
     """
 
     __app__ = QApplication(sys_argv)
@@ -50,6 +61,7 @@ class InputDialog:
     _main_layout: QVBoxLayout
     _fields: list[U[QWidget, QLayout,
                     tuple[U[str, QWidget], U[QWidget, QLayout]]]]
+    _validator: O[FormValidator] = None
     out: dict[str, U[str, int, bool]]
 
     def __init__(
@@ -61,6 +73,8 @@ class InputDialog:
         parent: QWidget = None,
         playsound: str = None,
         icon: QIcon = None,
+        validators: dict[str, U[Validator, list[Validator]]] = None,
+        rules: list[Rule] = None,
     ):
         """-----
         Parameters
@@ -75,7 +89,12 @@ class InputDialog:
 
         icon (QIcon, optional): [default=None] an icon to set for the dialog window
 
+        validators (dict[str, Validator | list[Validator]], optional): [default=None] validators for each field, by label. Use the InputDialog.Validate functions to create them
+
+        rules (list[Rule], optional): [default=None] cross-field rules. Use InputDialog.Validate.rule to create them
+
         """
+        started = monotonic()
         self.dialog = QDialog(parent)
         self.dialog.setWindowTitle(title)
         self.dialog.setMinimumWidth(450)
@@ -84,7 +103,8 @@ class InputDialog:
         # set defaults
         self.out = dict()
         self.dialog.setStyleSheet("QDialog {background-color: #202328;}\n"
-                                  "QWidget {font-size: 11pt;}")
+                                  "QWidget {font-size: 11pt;}\n"
+                                  "*[invalid=true] {border: 1px solid #e05555;}")
         # construct layouts
         self._main_layout = QVBoxLayout(self.dialog)
         scrollArea = QScrollArea(self.dialog)
@@ -110,35 +130,59 @@ class InputDialog:
         btnbox.accepted.connect(self._submit)
         btnbox.rejected.connect(self._cancel)
         btnbox.setCenterButtons(True)
+        if validators or rules:
+            status = QLabel()
+            status.setWordWrap(True)
+            status.setStyleSheet("color: #e05555;")
+            self._main_layout.addWidget(status)
+            self._validator = FormValidator(
+                fields={lbl: wgt for lbl, wgt in self._fields},
+                validators=validators,
+                rules=rules,
+                ok=btnbox.button(QDialogButtonBox.Ok),
+                status=status)
         self._main_layout.addWidget(btnbox)
         # run
         if playsound == "error":
             PlaySound("Hand")
         elif playsound == "alert":
             PlaySound("Beep")
-        self.dialog.exec()
+        runDialog(self, 'inputdialog',
+                  dict(title=title, fields=[[str(lbl), type(wgt).__name__] for lbl, wgt in self._fields]),
+                  self.dialog.exec, started)
+        history.record('inputdialog', title, [str(lbl) for lbl, _ in self._fields], self.out or None)
 
     def _submit(self):
         """called when the <Ok> button is pressed. Override this function to change the default action (default=set <self.out> to a dictionary where labelText=value, then close the input dialog)"""
 
+        if self._validator is not None and not self._validator.valid:
+            return
         for lbl, wgt in self._fields:
-            if isinstance(wgt, QLineEdit):
-                val = wgt.text()
-            elif isinstance(wgt, QComboBox):
-                val = wgt.currentText()
-            elif isinstance(wgt, (QSpinBox, QDoubleSpinBox)):
-                val = wgt.value()
-            elif isinstance(wgt, QCheckBox):
-                val = wgt.isChecked()
-            else:
-                val = "ERROR"
-            self.out[lbl] = val
+            self.out[lbl] = widgetValue(wgt)
         self.dialog.close()
 
     def _cancel(self):
         """called when the <Cancel> button is pressed. Override this function to change the default action (default=close input dialog)"""
         self.dialog.close()
 
+    def _replay(self, answer: O[dict[str, U[str, int, float, bool]]]):
+        """answer the dialog with a recorded answer, through <_submit> or <_cancel>. A strict <Driver> raises a \
+<ReplayError> if the answer does not pass validation"""
+
+        if not answer:
+            return self._cancel()
+        for lbl, wgt in self._fields:
+            if str(lbl) in answer:
+                setWidgetValue(wgt, answer[str(lbl)])
+        if self._validator is not None and not self._validator.validateNow():
+            driver = Driver.active
+            if driver is not None and driver.strict:
+                problems = [f'{lbl}: {err}' for lbl, err in self._validator.errors.items()]
+                problems += list(self._validator.ruleErrors.values())
+                raise ReplayError(f'the recorded answer to {self.dialog.windowTitle()!r} is not valid: '
+                                  + '; '.join(problems))
+        self._submit()
+
     class ChildWidget:
         """Builder class for the dialog. Available methods are checkbox, combobox, spinbox, or textbox"""
 
@@ -229,7 +273,8 @@ class InputDialog:
                 sbx.setValue(default)
             return sbx
 
-        def textbox(hint: str = None, default: str = None) -> QLineEdit:
+        def textbox(hint: str = None, default: str = None,
+                    completer: U[CompletionProvider, Source] = None) -> QLineEdit:
             """-----
             Build a QLineEdit
 
@@ -239,6 +284,9 @@ class InputDialog:
 
             default (str, optional): [default=None] the text to place in the textbox. This will overwrite the hint if both are provided
 
+            completer (CompletionProvider | list[str] | callable, optional): [default=None] a source of completions: a list, \
+a callable or coroutine function taking the typed text, or a CompletionProvider. Queries run off the GUI thread and are cached by prefix
+
 
             Returns:
             --------
@@ -252,9 +300,12 @@ class InputDialog:
                 txt.setText(default)
             elif hint:
                 txt.setPlaceholderText(hint)
+            if completer is not None:
+                AsyncCompleter(txt, completer)
             return txt
 
     ChWgt = ChildWidget
+    Validate = Validate
 
     @classmethod
     def multiinput(
@@ -265,6 +316,8 @@ class InputDialog:
         parent: QWidget = None,
         playsound: str = None,
         icon: QIcon = None,
+        validators: dict[str, U[Validator, list[Validator]]] = None,
+        rules: list[Rule] = None,
     ) -> dict[str, U[str, int, bool]]:
         """-----
         Asks the user for multiple inputs and returns the responses in a dictionary
@@ -283,6 +336,10 @@ class InputDialog:
 
         icon (QIcon, optional): [default=None] an icon to set for the dialog window
 
+        validators (dict[str, Validator | list[Validator]], optional): [default=None] validators for each field, by label. Fields are validated as they are edited and <Ok> is disabled until all are valid. Use the InputDialog.Validate functions to create them
+
+        rules (list[Rule], optional): [default=None] cross-field rules. Use InputDialog.Validate.rule to create them
+
 
         Returns:
         --------
@@ -303,6 +360,8 @@ class InputDialog:
                 input_fields=input_fields,
                 playsound=playsound,
                 icon=icon,
+                validators=validators,
+                rules=rules,
             ).out
             or None
         )
@@ -317,6 +376,7 @@ class InputDialog:
         parent: QWidget = None,
         playsound: str = None,
         icon: QIcon = None,
+        validators: U[Validator, list[Validator]] = None,
     ) -> O[str]:
         """-----
         Asks the user for a string input and returns the response
@@ -337,6 +397,8 @@ class InputDialog:
 
         icon (QIcon, optional): [default=None] an icon to set for the dialog window
 
+        validators (Validator | list[Validator], optional): [default=None] validators for the input. Use the InputDialog.Validate functions to create them
+
 
         Returns:
         --------
@@ -358,6 +420,7 @@ class InputDialog:
             input_fields=in_f,
             playsound=playsound,
             icon=icon,
+            validators={label: validators} if validators else None,
         ).out.get(label)
 
     @classmethod
@@ -478,8 +541,18 @@ class InputDialog:
 
 
 def test():
+    from time import sleep
+
     from PyQt5.QtWidgets import QMessageBox
 
+    def notTaken(word):
+        sleep(1)  # stands in for a slow lookup, e.g. a server round trip
+        return word != "taken"
+
+    def hosts(prefix):
+        sleep(0.5)  # stands in for a slow completion source
+        return [f"host-{i:04d}" for i in range(10_000) if f"host-{i:04d}".startswith(prefix)]
+
     fields = [
         ("This is a checkbox", InputDialog.ChildWidget.checkbox(default=True)),
         (
@@ -490,9 +563,35 @@ def test():
         ),
         ("This is a spinbox", InputDialog.ChildWidget.spinbox(from_=0, to=5, step=0.5)),
         ("This is a textbox", InputDialog.ChildWidget.textbox()),
+        (
+            "This is a textbox with completions",
+            InputDialog.ChildWidget.textbox(
+                hint="host-...",
+                completer=hosts,
+            ),
+        ),
     ]
     ans = InputDialog.multiinput(
-        title="test", input_fields=fields, message="An example multiinput InputDialog."
+        title="test",
+        input_fields=fields,
+        message="An example multiinput InputDialog.",
+        validators={
+            "This is a textbox": [
+                InputDialog.Validate.regex(r"\w+", "enter a single word"),
+                InputDialog.Validate.check(
+                    notTaken,
+                    "that word is taken",
+                    threaded=True,
+                ),
+            ]
+        },
+        rules=[
+            InputDialog.Validate.rule(
+                ["This is a checkbox", "This is a spinbox"],
+                lambda checked, num: checked or num > 0,
+                "the spinbox must be above 0 when the checkbox is unchecked",
+            )
+        ],
     )
     mbox = QMessageBox()
     mbox.setWindowTitle("Result")
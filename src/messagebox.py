@@ -1,12 +1,24 @@
 from sys import argv as sys_argv
-from typing import Union as U
+from typing import Optional as O, Union as U
+from time import monotonic
+from PyQt5.QtCore import Qt
 
 from PyQt5.QtWidgets import (
+    QAbstractButton,
     QApplication,
     QMessageBox,
-    QAbstractButton
+    QCheckBox
 )
 
+try:
+    from .pagedtext import PagedTextView, TextLike, textSource
+    from .history import history
+    from .driver import runDialog
+except ImportError:
+    from pagedtext import PagedTextView, TextLike, textSource
+    from history import history
+    from driver import runDialog
+
 
 class Messagebox:
     """-----
@@ -21,6 +33,10 @@ class Messagebox:
     showwarning: Show the user a simple warning dialog
 
     showerror: Show the user a simple error dialog
+
+
+    Messages longer than <previewRows> rows or <previewChars> characters, files (given as a pathlib.Path) and iterables \
+of lines are shown as a truncated preview, with the full text in a collapsible, paged details view
     """
 
     _icons = dict(noicon=QMessageBox.NoIcon,
@@ -47,33 +63,89 @@ class Messagebox:
                     retry=QMessageBox.Retry,
                     ignore=QMessageBox.Ignore)
     out: str = None
+    details: PagedTextView = None
+    previewRows: int = 20
+    previewChars: int = 2000
     __app__ = QApplication(sys_argv)
 
     def __init__(self,
                  title: str,
-                 message: str,
+                 message: TextLike,
                  icon: QMessageBox.Icon = QMessageBox.NoIcon,
                  buttons: U[QMessageBox.StandardButton,
                             QMessageBox.StandardButtons] = QMessageBox.Ok,
                  default: QMessageBox.StandardButton = QMessageBox.NoButton,
                  escape: QMessageBox.StandardButton = QMessageBox.NoButton):
+        started = monotonic()
         self.messagebox = QMessageBox()
         self.messagebox.setStyleSheet("font-size: 11pt;")
         self.messagebox.setWindowTitle(title)
-        self.messagebox.setText(message)
+        self._setMessage(message)
         self.messagebox.setIcon(icon)
         self.messagebox.setStandardButtons(buttons)
         self.messagebox.setDefaultButton(default)
         self.messagebox.setEscapeButton(escape)
         self.messagebox.setStyleSheet('font-size: 10pt;')
+        self._placeDetails()
         self.messagebox.buttonClicked.connect(self._btnclick)
-        self.messagebox.exec()
+        runDialog(self, 'messagebox',
+                  dict(title=title, message=self.messagebox.text(),
+                       buttons=[btn.text().lstrip("&").replace(' ', '').lower()
+                                for btn in self.messagebox.buttons()]),
+                  self.messagebox.exec, started)
+        history.record('messagebox', title, self.messagebox.text(), self.out)
+
+    def _setMessage(self, message: TextLike):
+        """show <message>, or a preview of it plus a <details> view if it is too long"""
+
+        if (isinstance(message, str) and len(message) <= self.previewChars
+                and message.count('\n') < self.previewRows):
+            self.messagebox.setText(message)
+            return
+        source = textSource(message)
+        preview, truncated = source.preview(self.previewRows, self.previewChars)
+        if not truncated:
+            self.messagebox.setText(preview)
+            return
+        self.messagebox.setTextFormat(Qt.PlainText)
+        self.messagebox.setText(f'{preview}\n\u2026')
+        self.details = PagedTextView(source, self.messagebox)
+        self.details.hide()
+        toggle = QCheckBox('Show details')
+        toggle.toggled.connect(self._toggleDetails)
+        self.messagebox.setCheckBox(toggle)
+
+    def _placeDetails(self):
+        """add the <details> view under the messagebox's grid; setIcon and setCheckBox
+        rebuild that grid, so this must run after the last of them"""
+
+        if self.details is None:
+            return
+        layout = self.messagebox.layout()
+        layout.addWidget(self.details, layout.rowCount(), 0, 1, layout.columnCount())
+
+    def _toggleDetails(self, show: bool):
+        self.details.setVisible(show)
+        self.messagebox.adjustSize()
 
     def _btnclick(self, btn: QAbstractButton):
         self.out = btn.text().lstrip("&").replace(' ', '').lower()
 
+    def _replay(self, answer: O[str]):
+        """answer the messagebox with a recorded answer, through <_btnclick>"""
+
+        if answer is None:
+            return
+        btn = self.messagebox.button(self._buttons.get(answer, QMessageBox.NoButton))
+        if btn is None:
+            btn = next((b for b in self.messagebox.buttons()
+                        if b.text().lstrip("&").replace(' ', '').lower() == answer), None)
+        if btn is None:
+            raise ValueError(f'the messagebox has no {answer!r} button to replay')
+        self._btnclick(btn)
+
     @classmethod
-    def askquestion(cls, title: str, message: str, buttons: tuple[str] = ("yes", "no"), icon: str = "question") -> str:
+    def askquestion(cls, title: str, message: TextLike, buttons: tuple[str] = ("yes", "no"), icon: str = "question") -> str:
         """-----
         Ask the user a question
 
@@ -81,7 +153,7 @@ class Messagebox:
         ----------
         title (str): The messagebox window title
 
-        message (str): The question to ask in the body of the messagebox
+        message (str | Path | Iterable[str]): The question to ask in the body of the messagebox
 
         buttons (tuple[str], optional): [default=("yes", "no")] The buttons to show. The first item listed will be set as the \
 default button, the last will be the 'escape' button if listed. Any combination of: ok, open, save, cancel, close, discard, \
@@ -112,7 +184,7 @@ Note that this option will also change the sound that plays when the messagebox
                    escape=escape_btn).out
 
     @classmethod
-    def showinfo(cls, title: str, message: str) -> None:
+    def showinfo(cls, title: str, message: TextLike) -> None:
         """-----
         Show an infobox
 
@@ -120,7 +192,7 @@ Note that this option will also change the sound that plays when the messagebox
         ----------
         title (str): The messagebox window title
 
-        message (str): The info message in the body of the messagebox
+        message (str | Path | Iterable[str]): The info message in the body of the messagebox
         """
 
         cls(title=title,
@@ -128,7 +200,7 @@ Note that this option will also change the sound that plays when the messagebox
             icon=QMessageBox.Information)
 
     @classmethod
-    def showwarning(cls, title: str, message: str) -> None:
+    def showwarning(cls, title: str, message: TextLike) -> None:
         """-----
         Show a warning
 
@@ -136,7 +208,7 @@ Note that this option will also change the sound that plays when the messagebox
         ----------
         title (str): The messagebox window title
 
-        message (str): The warning message in the body of the messagebox
+        message (str | Path | Iterable[str]): The warning message in the body of the messagebox
         """
 
         cls(title=title,
@@ -144,7 +216,7 @@ Note that this option will also change the sound that plays when the messagebox
             icon=QMessageBox.Warning)
 
     @classmethod
-    def showerror(cls, title: str, message: str) -> None:
+    def showerror(cls, title: str, message: TextLike) -> None:
         """-----
         Show an error
 
@@ -152,7 +224,7 @@ Note that this option will also change the sound that plays when the messagebox
         ----------
         title (str): The messagebox window title
 
-        message (str): The error message in the body of the messagebox
+        message (str | Path | Iterable[str]): The error message in the body of the messagebox
         """
 
         cls(title=title,
@@ -169,6 +241,8 @@ def test():
                            "This is Messagebox.showwarning")
     Messagebox.showerror("Show Error",
                          "This is Messagebox.showerror")
+    Messagebox.showinfo("Show Long Info",
+                        (f"line {i:,} of a very long message\n" for i in range(1_000_000)))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,349 @@
+from collections import deque
+from itertools import count
+from pathlib import Path
+import win32event as event32
+import win32gui as gui32
+import win32con as con32
+import logging
+
+from heapq import (
+    heapify,
+    heappop,
+    heappush
+)
+from threading import (
+    Thread,
+    Event
+)
+from time import monotonic
+from typing import (
+    Callable,
+    Optional as O,
+    Union as U
+)
+
+try:
+    from .balloontip import CreateBalloontip, ErrorPolicy
+    from .history import history
+except ImportError:
+    from balloontip import CreateBalloontip, ErrorPolicy
+    from history import history
+
+logger = logging.getLogger(__name__)
+
+WM_NOTIFYICON = con32.WM_USER + 20
+NIN_BALLOONTIMEOUT = con32.WM_USER + 4
+NIN_BALLOONUSERCLICK = con32.WM_USER + 5
+
+Callback = Callable[['Notification'], None]
+
+
+class Notification(CreateBalloontip):
+    """A balloontip owned by a <NotificationManager>. Use <NotificationManager.notify> to create one"""
+
+    manager: 'NotificationManager'
+    onclick: O[Callback]
+    ondismiss: O[Callback]
+    ontimeout: O[Callback]
+    closed: bool = False
+    _deadline: float
+
+    def __init__(self, manager: 'NotificationManager', uid: int, title: str, message: str,
+                 timeout: U[int, float], icon: O[str], silent: bool, onerror: O[ErrorPolicy],
+                 onclick: O[Callback], ondismiss: O[Callback], ontimeout: O[Callback]):
+        self.manager = manager
+        self.title = title
+        self.msg = message
+        self.timeout = timeout
+        self.icon = icon
+        self.onclick = onclick
+        self.ondismiss = ondismiss
+        self.ontimeout = ontimeout
+        self._setPolicy(onerror)
+        self._uid = uid
+        self._hwnd = manager._hwnd
+        self._hinst = manager._hinst
+        self._infoFlags = gui32.NIIF_NOSOUND if silent else 0
+
+    def update(self, message: O[str] = None, title: O[str] = None, timeout: O[U[int, float]] = None) -> None:
+        """-----
+        Change the notification's text in place
+
+        Parameters
+        ----------
+        message (str, optional): [default=None] The new body text. None keeps the current one
+
+        title (str, optional): [default=None] The new title. None keeps the current one
+
+        timeout (int|float, optional): [default=None] Seconds from now until the notification expires. None keeps the current expiry
+        """
+
+        self.manager._post(self.manager._modify, self, message, title, timeout)
+
+    def close(self) -> None:
+        """Remove the notification without running any callback"""
+
+        self.manager._post(self.manager._remove, self, None)
+
+
+class NotificationManager:
+    """-----
+    Runs a single Win32 message loop that owns many balloontip icons
+
+    Every notification gets its own icon id. Clicks and balloon dismissals are dispatched to the notification's \
+callbacks, and expirations are scheduled on one timer heap, so any number of live notifications share one thread
+
+    Methods
+    ----------
+    notify: Show a new notification and return its <Notification> handle
+
+    shutdown: Remove all notifications and stop the message loop
+    """
+
+    onerror: O[ErrorPolicy]
+    live: dict[int, Notification]
+    _hinst: int
+    _hwnd: int
+    _classAtom: int
+    _wake: int
+    _commands: deque
+    _timers: list[tuple[float, int]]
+    _running: bool = True
+    _setupError: O[BaseException] = None
+
+    def __init__(self, onerror: O[ErrorPolicy] = None):
+        """-----
+        Parameters
+        ----------
+        onerror (str|callable, optional): [default=None] How notifications report errors. See <CreateBalloontip>
+        """
+
+        self.onerror = onerror
+        self.live = dict()
+        self._commands = deque()
+        self._timers = list()
+        self._uids = count(1)
+        self._wake = event32.CreateEvent(None, False, False, None)
+        self._ready = Event()
+        self._thread = Thread(target=self._loop, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._setupError is not None:
+            raise self._setupError
+
+    def __enter__(self) -> 'NotificationManager':
+        return self
+
+    def __exit__(self, *_):
+        self.shutdown()
+
+    def notify(self, title: str, message: str, timeout: U[int, float] = 6,
+               icon: O[str] = 'default', silent: bool = False,
+               onclick: O[Callback] = None, ondismiss: O[Callback] = None,
+               ontimeout: O[Callback] = None) -> O[Notification]:
+        """-----
+        Show a new notification
+
+        Parameters
+        ----------
+        title (str): The text to display at the top of the balloontip
+
+        message (str): The text to display as the body of the balloontip
+
+        timeout (int|float, optional): [default=6] Seconds until the notification's icon is removed
+
+        icon (str, optional): [default="default"] The balloontip's icon. One of "default", "info", "warning", "error", or an *.ico image file path
+
+        silent (bool, optional): [default=False] Whether to play a sound when the balloontip is displayed
+
+        onclick (callable, optional): [default=None] Called with the notification when the balloon or its icon is clicked
+
+        ondismiss (callable, optional): [default=None] Called with the notification when the balloon is closed by the user or moved to the action center
+
+        ontimeout (callable, optional): [default=None] Called with the notification when <timeout> expires
+
+
+        Returns:
+        --------
+        None : The notification could not be shown (see <onerror>)
+
+        Notification : a handle to update or close the notification
+        """
+
+        if not self._running:
+            raise RuntimeError('the NotificationManager has been shut down')
+        ntf = Notification(self, next(self._uids), title, message, timeout, icon, silent, self.onerror,
+                           onclick, ondismiss, ontimeout)
+        try:
+            timeout = float(timeout)
+            if timeout <= 0:
+                raise ValueError(
+                    "the 'timeout' parameter must be greater than 0")
+        except Exception as e:
+            ntf._showError(e, 'exit')
+            return None
+        # icons are loaded here so errors surface on the calling thread
+        if not ntf._getIcon():
+            return None
+        self._post(self._add, ntf, timeout)
+        return ntf
+
+    def shutdown(self) -> None:
+        """Remove all notifications and stop the message loop"""
+
+        if self._running:
+            self._post(self._stop)
+            self._thread.join()
+
+    # ---- called from any thread ----
+
+    def _post(self, func: Callable, *args) -> None:
+        self._commands.append((func, args))
+        event32.SetEvent(self._wake)
+
+    # ---- called on the message loop thread ----
+
+    def _loop(self):
+        message_map = {WM_NOTIFYICON: self._onNotify, }
+        wc = gui32.WNDCLASS()
+        self._hinst = wc.hInstance = gui32.GetModuleHandle(None)
+        wc.lpszClassName = f'PythonNotificationManager{id(self)}'
+        wc.lpfnWndProc = message_map
+        self._classAtom = None
+        try:
+            self._classAtom = gui32.RegisterClass(wc)
+            style = con32.WS_OVERLAPPED | con32.WS_SYSMENU
+            self._hwnd = gui32.CreateWindow(self._classAtom, 'Taskbar', style, 0, 0, con32.CW_USEDEFAULT,
+                                            con32.CW_USEDEFAULT, 0, 0, self._hinst, None)
+            gui32.UpdateWindow(self._hwnd)
+        except BaseException as e:
+            # handed to __init__, which re-raises it
+            self._setupError = e
+            self._running = False
+            if self._classAtom is not None:
+                gui32.UnregisterClass(self._classAtom, self._hinst)
+            return
+        finally:
+            self._ready.set()
+        try:
+            while self._running:
+                while self._commands:
+                    func, args = self._commands.popleft()
+                    try:
+                        func(*args)
+                    except Exception:
+                        logger.exception('Error in %s', Path(__file__).parent)
+                try:
+                    self._expire(monotonic())
+                except Exception:
+                    logger.exception('Error in %s', Path(__file__).parent)
+                if not self._running:
+                    break
+                event32.MsgWaitForMultipleObjects([self._wake], False, self._waitTime(),
+                                                  event32.QS_ALLINPUT)
+                if gui32.PumpWaitingMessages():
+                    self._running = False
+        finally:
+            for ntf in list(self.live.values()):
+                self._remove(ntf, None)
+            self._running = False
+            gui32.DestroyWindow(self._hwnd)
+            gui32.UnregisterClass(self._classAtom, self._hinst)
+
+    def _waitTime(self) -> int:
+        """milliseconds until the earliest expiry"""
+
+        if not self._timers:
+            return event32.INFINITE
+        return max(0, int((self._timers[0][0] - monotonic()) * 1000) + 1)
+
+    def _schedule(self, ntf: Notification, timeout: float):
+        ntf._deadline = monotonic() + timeout
+        heappush(self._timers, (ntf._deadline, ntf._uid))
+        # entries are invalidated lazily; compact once they dominate the heap
+        if len(self._timers) > 2 * len(self.live) + 64:
+            self._timers = [t for t in self._timers
+                            if t[1] in self.live and self.live[t[1]]._deadline == t[0]]
+            heapify(self._timers)
+
+    def _expire(self, now: float):
+        timers = self._timers
+        while timers and timers[0][0] <= now:
+            deadline, uid = heappop(timers)
+            ntf = self.live.get(uid)
+            if ntf is not None and ntf._deadline == deadline:
+                self._remove(ntf, ntf.ontimeout)
+
+    def _add(self, ntf: Notification, timeout: float):
+        gui32.Shell_NotifyIcon(gui32.NIM_ADD, ntf._nid())
+        ntf._added = True
+        self.live[ntf._uid] = ntf
+        history.record('notification', ntf.title, ntf.msg)
+        self._schedule(ntf, timeout)
+
+    def _modify(self, ntf: Notification, message: O[str], title: O[str], timeout: O[float]):
+        if ntf.closed:
+            return
+        if message is not None:
+            ntf.msg = message
+        if title is not None:
+            ntf.title = title
+        gui32.Shell_NotifyIcon(gui32.NIM_MODIFY, ntf._nid(gui32.NIF_TIP | gui32.NIF_INFO))
+        if timeout is not None:
+            self._schedule(ntf, float(timeout))
+
+    def _remove(self, ntf: Notification, callback: O[Callback]):
+        if ntf.closed:
+            return
+        ntf.closed = True
+        self.live.pop(ntf._uid, None)
+        if ntf._added:
+            gui32.Shell_NotifyIcon(gui32.NIM_DELETE, (self._hwnd, ntf._uid))
+            ntf._added = False
+        self._dispatch(ntf, callback)
+
+    @staticmethod
+    def _dispatch(ntf: Notification, callback: O[Callback]):
+        if callback is None:
+            return
+        try:
+            callback(ntf)
+        except Exception as e:
+            # raising would end the message loop and every other notification with it
+            if ntf.onerror == 'raise':
+                ntf._logError(e, 'continue')
+            else:
+                ntf._showError(e, 'continue')
+
+    def _stop(self):
+        self._running = False
+
+    def _onNotify(self, hwnd, msg, wparam, lparam):
+        ntf = self.live.get(wparam)
+        if ntf is None:
+            return 0
+        if lparam in (NIN_BALLOONUSERCLICK, con32.WM_LBUTTONUP):
+            self._remove(ntf, ntf.onclick)
+        elif lparam == NIN_BALLOONTIMEOUT:
+            # the balloon was closed or moved to the action center; the icon stays until it expires
+            self._dispatch(ntf, ntf.ondismiss)
+        return 0
+
+
+def test():
+    from time import sleep
+
+    with NotificationManager() as manager:
+        for i in range(1, 4):
+            manager.notify(title=f"Notification {i}",
+                           message=f"This notification expires after {2 * i} seconds",
+                           timeout=2 * i,
+                           silent=i > 1,
+                           onclick=lambda n: print(f'clicked "{n.title}"'),
+                           ondismiss=lambda n: print(f'dismissed "{n.title}"'),
+                           ontimeout=lambda n: print(f'"{n.title}" expired'))
+        sleep(7)
+
+
+if __name__ == '__main__':
+    test()
@@ -0,0 +1,222 @@
+from sys import argv as sys_argv
+from collections.abc import Iterable as _Iterable
+from itertools import islice
+from pathlib import Path
+import mmap
+
+from PyQt5.QtGui import (
+    QFontDatabase,
+    QPainter
+)
+from PyQt5.QtWidgets import (
+    QAbstractScrollArea,
+    QApplication,
+    QWidget
+)
+from typing import (
+    Iterable,
+    Iterator,
+    Union as U
+)
+
+MAX_LINE = 4096
+"""lines longer than this are wrapped onto several rows"""
+
+TextLike = U[str, Path, Iterable[str]]
+
+
+class TextSource:
+    """Random access to the rows of a text. Positions are abstract units (characters, bytes or lines) in the range 0..<size>"""
+
+    size: int = 0
+    unitsPerRow: int = 1
+
+    def rowStart(self, pos: int) -> int:
+        """the position of the first row starting at or before <pos>"""
+        raise NotImplementedError
+
+    def rows(self, pos: int, count: int) -> list[str]:
+        """up to <count> rows starting at <pos>"""
+        raise NotImplementedError
+
+    def preview(self, maxRows: int, maxChars: int) -> tuple[str, bool]:
+        """the start of the text, and whether it was truncated"""
+
+        rows = self.rows(0, maxRows + 1)
+        text = '\n'.join(rows[:maxRows])
+        truncated = len(rows) > maxRows
+        if len(text) > maxChars:
+            text, truncated = text[:maxChars], True
+        return text, truncated
+
+
+class _BufferSource(TextSource):
+    """rows of a str or a memory-mapped file, located by searching for newlines on demand"""
+
+    def __init__(self, buffer: U[str, mmap.mmap], encoding: str = 'utf-8'):
+        self._buf = buffer
+        self._binary = not isinstance(buffer, str)
+        self._nl = b'\n' if self._binary else '\n'
+        self._encoding = encoding
+        self.size = len(buffer)
+        # estimate the average row length from the first 64 KiB
+        sample = min(self.size, 1 << 16)
+        self.unitsPerRow = max(1, min(MAX_LINE, sample // (buffer[:sample].count(self._nl) + 1)))
+
+    def rowStart(self, pos: int) -> int:
+        pos = max(0, min(pos, self.size))
+        lo = max(0, pos - MAX_LINE)
+        nl = self._buf.rfind(self._nl, lo, pos)
+        if nl >= 0:
+            return nl + 1
+        # no newline within one row: <pos> is inside a wrapped line
+        return 0 if lo == 0 else pos
+
+    def rows(self, pos: int, count: int) -> list[str]:
+        buf, nl, size = self._buf, self._nl, self.size
+        out = list()
+        while len(out) < count and pos < size:
+            end = buf.find(nl, pos, pos + MAX_LINE)
+            if end < 0:
+                end = nxt = min(size, pos + MAX_LINE)
+            else:
+                nxt = end + 1
+            row = buf[pos:end]
+            if self._binary:
+                row = row.decode(self._encoding, 'replace')
+            out.append(row.rstrip('\r'))
+            pos = nxt
+        return out
+
+
+class _IteratorSource(TextSource):
+    """rows pulled from an iterator of lines only as far as they have been requested"""
+
+    def __init__(self, lines: Iterable[str]):
+        self._iter: Iterator[str] = iter(lines)
+        self._rows: list[str] = list()
+        self._done = False
+
+    @property
+    def size(self) -> int:
+        # leave room to scroll past the loaded rows until the iterator is exhausted
+        return len(self._rows) + (0 if self._done else 1)
+
+    def rowStart(self, pos: int) -> int:
+        return max(0, pos)
+
+    def rows(self, pos: int, count: int) -> list[str]:
+        need = pos + count - len(self._rows)
+        if need > 0 and not self._done:
+            for line in islice(self._iter, need):
+                line = line.rstrip('\r\n')
+                while len(line) > MAX_LINE:
+                    self._rows.append(line[:MAX_LINE])
+                    line = line[MAX_LINE:]
+                self._rows.append(line)
+            if len(self._rows) < pos + count:
+                self._done = True
+        return self._rows[pos:pos + count]
+
+
+def textSource(text: TextLike, encoding: str = 'utf-8') -> TextSource:
+    """-----
+    Build a TextSource
+
+    Parameters
+    ----------
+    text (str | Path | Iterable[str]): a string, a path to a text file (memory-mapped), or an iterable of lines
+
+    encoding (str, optional): [default="utf-8"] the file's encoding
+
+
+    Returns:
+    --------
+    TextSource : the source
+    """
+
+    if isinstance(text, TextSource):
+        return text
+    if isinstance(text, str):
+        return _BufferSource(text)
+    if isinstance(text, Path):
+        if not text.stat().st_size:
+            return _BufferSource('')
+        with open(text, 'rb') as f:
+            return _BufferSource(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), encoding)
+    if isinstance(text, _Iterable):
+        return _IteratorSource(text)
+    raise TypeError('< text > must be a str, a pathlib.Path, or an iterable of lines')
+
+
+class PagedTextView(QAbstractScrollArea):
+    """-----
+    A read-only text view that only reads and paints the rows currently visible
+
+    The vertical scrollbar maps to positions in the source, so opening the view costs the same for 1 KB as for 100 MB
+    """
+
+    __app__ = QApplication(sys_argv)
+    source: TextSource
+    _scale: int = 1
+
+    def __init__(self, text: TextLike, parent: QWidget = None, encoding: str = 'utf-8'):
+        """-----
+        Parameters
+        ----------
+        text (str | Path | Iterable[str] | TextSource): the text to show. A pathlib.Path is memory-mapped
+
+        parent (QWidget, optional): [default=None] the parent widget
+
+        encoding (str, optional): [default="utf-8"] the encoding of a file
+        """
+
+        super().__init__(parent)
+        self.source = textSource(text, encoding)
+        self.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.setMinimumSize(600, 300)
+        self._updateScrollbar()
+
+    def _visibleRows(self) -> int:
+        return max(1, self.viewport().height() // self.fontMetrics().lineSpacing())
+
+    def _updateScrollbar(self):
+        src = self.source
+        # QScrollBar ranges are 32-bit
+        self._scale = max(1, -(-src.size // (1 << 30)))
+        step = max(1, src.unitsPerRow // self._scale)
+        vsb = self.verticalScrollBar()
+        vsb.setRange(0, max(0, (src.size - 1) // self._scale))
+        vsb.setSingleStep(step)
+        vsb.setPageStep(step * max(1, self._visibleRows() - 1))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._updateScrollbar()
+
+    def paintEvent(self, _):
+        size = self.source.size
+        pos = self.source.rowStart(self.verticalScrollBar().value() * self._scale)
+        rows = self.source.rows(pos, self._visibleRows() + 1)
+        if self.source.size != size:
+            self._updateScrollbar()
+        painter = QPainter(self.viewport())
+        metrics = self.fontMetrics()
+        lineSpacing = metrics.lineSpacing()
+        y = metrics.ascent()
+        for row in rows:
+            painter.drawText(4, y, row)
+            y += lineSpacing
+        painter.end()
+
+
+def test():
+    lines = (f"{i:>9,}  {'lorem ipsum dolor sit amet ' * (i % 5 + 1)}" for i in range(1_000_000))
+    view = PagedTextView(lines)
+    view.setWindowTitle("PagedTextView Test")
+    view.show()
+    PagedTextView.__app__.exec()
+
+
+if __name__ == '__main__':
+    test()
@@ -1,38 +1,241 @@
+from collections import Counter
+from threading import Lock, Thread
+from itertools import count
+from pathlib import Path
+
 from subprocess import (
     Popen,
     CREATE_NO_WINDOW
 )
-from pathlib import Path
+from time import (
+    monotonic,
+    sleep
+)
+from typing import (
+    Callable,
+    Optional as O,
+    Protocol
+)
+
+
+class Voice(Protocol):
+    """a playing sound, as returned by a <SoundScheduler> backend"""
+
+    def poll(self) -> O[int]: ...
+
+    def kill(self) -> None: ...
+
+
+def _powershell(cmd: str) -> Voice:
+    return Popen(['powershell', cmd], creationflags=CREATE_NO_WINDOW)
+
+
+class SoundScheduler:
+    """-----
+    Decides when requested sounds play
+
+    - at most <maxVoices> sounds play at once. A sound with a higher priority than a playing one stops it
+    - a sound requested again within <window> seconds of the last time it was accepted is suppressed
+    - sounds that cannot play yet wait in a queue of at most <maxQueue>, highest priority first. \
+When it is full, the oldest sound of the lowest priority is dropped
+
+    Counters are kept in <stats>. Pass a fake <backend> and <clock>, and autopump=False, to drive it by hand with <pump>
+    """
+
+    priorities = dict(Hand=3, Exclamation=2, Question=1, Asterisk=1, Beep=0)
+    defaultPriority: int = 1
+    stats: Counter
+
+    def __init__(self,
+                 backend: Callable[[str], Voice] = _powershell,
+                 clock: Callable[[], float] = monotonic,
+                 maxVoices: int = 2,
+                 window: float = 0.5,
+                 maxQueue: int = 8,
+                 autopump: bool = True,
+                 interval: float = 0.05):
+        """-----
+        Parameters
+        ----------
+        backend (callable, optional): [default=PowerShell] starts a sound from a command and returns an object with poll() and kill()
+
+        clock (callable, optional): [default=time.monotonic] returns the current time in seconds
+
+        maxVoices (int, optional): [default=2] the maximum number of sounds playing at once
+
+        window (float, optional): [default=0.5] seconds after an accepted sound during which a repeated request for it is suppressed
+
+        maxQueue (int, optional): [default=8] the maximum number of sounds waiting to play
+
+        autopump (bool, optional): [default=True] start queued sounds from a background thread as voices finish
 
+        interval (float, optional): [default=0.05] seconds between two checks of the background thread
+        """
 
-def PlaySound(sound: str = "Hand"):
+        self.backend = backend
+        self.clock = clock
+        self.maxVoices = maxVoices
+        self.window = window
+        self.maxQueue = maxQueue
+        self.autopump = autopump
+        self.interval = interval
+        self.stats = Counter()
+        self._voices: list[tuple[int, int, str, Voice]] = list()
+        self._queue: list[tuple[int, int, str, str]] = list()
+        self._lastAccepted: dict[str, float] = dict()
+        self._seq = count()
+        self._lock = Lock()
+        self._pumping = False
+
+    @property
+    def playing(self) -> list[str]:
+        """the keys of the sounds playing"""
+        return [key for _, _, key, _ in self._voices]
+
+    @property
+    def queued(self) -> list[str]:
+        """the keys of the queued sounds, next first"""
+        return [key for _, _, key, _ in sorted(self._queue, key=lambda q: (-q[0], q[1]))]
+
+    def submit(self, key: str, cmd: str, priority: O[int] = None) -> bool:
+        """-----
+        Request a sound
+
+        Parameters
+        ----------
+        key (str): identifies the sound for duplicate suppression
+
+        cmd (str): the command passed to the backend
+
+        priority (int, optional): [default=None] the sound's priority. Defaults to <priorities[key]>, or <defaultPriority>
+
+
+        Returns:
+        --------
+        bool : False if the sound was suppressed, or dropped because the queue is full of higher-priority sounds, \
+otherwise True (played or queued)
+        """
+
+        if priority is None:
+            priority = self.priorities.get(key, self.defaultPriority)
+        with self._lock:
+            self.stats['requested'] += 1
+            now = self.clock()
+            last = self._lastAccepted.get(key)
+            if last is not None and now - last < self.window:
+                self.stats['suppressed'] += 1
+                return False
+            self._reap()
+            if len(self._voices) < self.maxVoices:
+                self._start(priority, key, cmd)
+            elif priority > min(v[0] for v in self._voices):
+                victim = min(self._voices, key=lambda v: (v[0], v[1]))
+                self._voices.remove(victim)
+                victim[3].kill()
+                self.stats['preempted'] += 1
+                self._start(priority, key, cmd)
+            elif not self._enqueue(priority, key, cmd):
+                return False
+            self._lastAccepted[key] = now
+            if self._queue and self.autopump and not self._pumping:
+                self._pumping = True
+                Thread(target=self._pumpLoop, daemon=True).start()
+        return True
+
+    def pump(self) -> None:
+        """forget finished sounds and start queued ones in their place"""
+
+        with self._lock:
+            self._reap()
+            while self._queue and len(self._voices) < self.maxVoices:
+                nxt = max(self._queue, key=lambda q: (q[0], -q[1]))
+                self._queue.remove(nxt)
+                priority, _, key, cmd = nxt
+                self._start(priority, key, cmd)
+
+    def _pumpLoop(self):
+        try:
+            while True:
+                sleep(self.interval)
+                self.pump()
+                with self._lock:
+                    if not self._queue:
+                        self._pumping = False
+                        return
+        except BaseException:
+            self._pumping = False
+            raise
+
+    def _reap(self):
+        self._voices = [v for v in self._voices if v[3].poll() is None]
+
+    def _start(self, priority: int, key: str, cmd: str):
+        self._voices.append((priority, next(self._seq), key, self.backend(cmd)))
+        self.stats['played'] += 1
+
+    def _enqueue(self, priority: int, key: str, cmd: str) -> bool:
+        if len(self._queue) >= self.maxQueue:
+            oldest = min(self._queue, key=lambda q: (q[0], q[1]))
+            if oldest[0] > priority:
+                # everything queued outranks the new sound
+                self.stats['dropped'] += 1
+                return False
+            self._queue.remove(oldest)
+            self.stats['dropped'] += 1
+        self._queue.append((priority, next(self._seq), key, cmd))
+        self.stats['queued'] += 1
+        return True
+
+
+scheduler = SoundScheduler()
+
+
+def PlaySound(sound: str = "Hand", priority: O[int] = None) -> bool:
     """-----
-    Play a default Windows 10 sound
+    Play a default Windows 10 sound through the shared <scheduler>
 
     Parameters
     ----------
     sound (str, optional): [default="Hand"] Which sound to play. One of "Asterisk", "Beep", "Exclamation", "Hand", "Question", or a "Windows <_>.wav" file from C:\\WINDOWS\\Media
+
+    priority (int, optional): [default=None] The sound's priority. Defaults to <SoundScheduler.priorities>: "Hand" pre-empts "Exclamation", which pre-empts "Question", "Asterisk" and .wav files, which pre-empt "Beep"
+
+
+    Returns:
+    --------
+    bool : False if the same sound was requested too recently and suppressed, or dropped from a full queue, otherwise True
     """
 
-    syssounds = ["Asterisk", "Beep", "Exclamation", "Hand", "Question"]
+    # the registry events behind each system sound; their .wav is played synchronously
+    # like the files below, so the scheduler sees the voice until the sound ends
+    syssounds = dict(Asterisk="SystemAsterisk", Beep=".Default", Exclamation="SystemExclamation",
+                     Hand="SystemHand", Question="SystemQuestion")
     winsounds = [p for p in Path('C:\\WINDOWS\\Media').glob('Windows *.wav')
                  if sound in p.stem]
     Sound = sound.title()
     if Sound in syssounds:
-        cmd = f'[system.media.systemsounds]::{Sound}.play()'
+        key = Sound
+        cmd = ("$f = [Environment]::ExpandEnvironmentVariables((Get-ItemProperty "
+               f"'HKCU:\\AppEvents\\Schemes\\Apps\\.Default\\{syssounds[Sound]}\\.Current').'(default)'); "
+               "if ($f) { (new-object Media.SoundPlayer $f).playsync() }")
     elif winsounds:
-        cmd = f'(new-object Media.SoundPlayer "{winsounds[0]}").play()'
+        key = winsounds[0].stem
+        cmd = f'(new-object Media.SoundPlayer "{winsounds[0]}").playsync()'
     else:
         raise ValueError('< sound > parameter must be one of "Asterisk", "Beep", "Exclamation", '
                          '"Hand", "Question", or a "Windows *.wav" file from C: \\WINDOWS\\Media')
-    Popen(['powershell', cmd], creationflags=CREATE_NO_WINDOW)
+    return scheduler.submit(key, cmd, priority)
 
 
 def test():
-    from time import sleep
     PlaySound()
     sleep(2)
     PlaySound("Asterisk")
+    sleep(2)
+    for sound in ("Asterisk", "Asterisk", "Beep", "Question", "Hand"):
+        PlaySound(sound)
+    sleep(2)
+    print(dict(scheduler.stats))
 
 
 if __name__ == "__main__":
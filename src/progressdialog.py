@@ -0,0 +1,203 @@
+from sys import argv as sys_argv
+from datetime import timedelta
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QIcon
+from threading import Event, Thread
+from time import monotonic
+
+from PyQt5.QtWidgets import (
+    QProgressDialog,
+    QApplication,
+    QWidget
+)
+from typing import (
+    Iterable,
+    Iterator,
+    Optional as O,
+    TypeVar
+)
+
+T = TypeVar('T')
+
+
+class ProgressDialog:
+    """-----
+    Display a PyQt5.QProgressDialog while iterating over an iterable
+
+    Iterating over a ProgressDialog yields the wrapped iterable's items unchanged. The dialog is repainted once \
+every <interval> seconds, as soon as the current item is done; between repaints the only cost per item is a counter \
+and a flag check. Iterate on the GUI thread \
+(the thread that imported winnotify): events are pumped on each repaint, which keeps the <Cancel> button responsive
+
+
+    Attributes
+    ----------
+    count (int): the number of items yielded, refreshed on each repaint and when iteration ends
+
+    canceled (bool): whether the user pressed <Cancel>. Iteration stops as soon as this is noticed
+    """
+
+    __app__ = QApplication(sys_argv)
+    count: int = 0
+    canceled: bool = False
+    total: O[int]
+    interval: float
+    _iterable: Iterable
+    _label: str
+
+    def __init__(
+        self,
+        iterable: Iterable[T],
+        title: str = 'Progress',
+        total: O[int] = None,
+        label: str = None,
+        interval: float = 0.1,
+        parent: QWidget = None,
+        icon: QIcon = None,
+    ):
+        """-----
+        Parameters
+        ----------
+        iterable (Iterable): the items to iterate over
+
+        title (str, optional): [default="Progress"] the window title
+
+        total (int, optional): [default=None] the expected number of items. Defaults to len(<iterable>) if available, \
+otherwise the dialog shows a busy indicator without an ETA
+
+        label (str, optional): [default=None] the text to show above the statistics. Defaults to <title>
+
+        interval (float, optional): [default=0.1] seconds between two repaints
+
+        parent (QWidget, optional): [default=None] the parent widget
+
+        icon (QIcon, optional): [default=None] an icon to set for the dialog window
+        """
+
+        if total is None:
+            try:
+                total = len(iterable)
+            except TypeError:
+                pass
+        self._iterable = iterable
+        self._label = title if label is None else label
+        self.total = total
+        self.interval = interval
+        self.dialog = QProgressDialog(self._label, 'Cancel', 0, 1000 if total else 0, parent)
+        self.dialog.setWindowTitle(title)
+        self.dialog.setMinimumWidth(450)
+        self.dialog.setWindowModality(Qt.WindowModal)
+        self.dialog.setMinimumDuration(0)
+        self.dialog.setAutoReset(False)
+        self.dialog.setAutoClose(False)
+        if icon:
+            self.dialog.setWindowIcon(icon)
+        self.dialog.setStyleSheet("QWidget {font-size: 10pt;}")
+
+    def __len__(self) -> int:
+        if self.total is None:
+            raise TypeError('the total number of items is unknown')
+        return self.total
+
+    def __iter__(self) -> Iterator[T]:
+        # a clock thread raises <due> every <interval>, so the per-item cost is a counter and a flag check,
+        # and a slow item is followed by a repaint however fast the items before it were
+        due = [False]
+        stop = Event()
+        Thread(target=self._tick, args=(due, stop), daemon=True).start()
+        start = monotonic()
+        count = 0
+        self.dialog.show()
+        self._repaint(0, 0.0)
+        try:
+            for item in self._iterable:
+                yield item
+                count += 1
+                if not due[0]:
+                    continue
+                due[0] = False
+                self.count = count
+                self._repaint(count, monotonic() - start)
+                if self.dialog.wasCanceled():
+                    self.canceled = True
+                    break
+        finally:
+            stop.set()
+            self.count = count
+            self.dialog.close()
+
+    def _tick(self, due: list[bool], stop: Event):
+        while not stop.wait(self.interval):
+            due[0] = True
+
+    def _repaint(self, count: int, elapsed: float):
+        rate = count / elapsed if elapsed else 0.0
+        stats = f'{count:,}'
+        if self.total:
+            stats += f' / {self.total:,}'
+            self.dialog.setValue(min(1000, int(1000 * count / self.total)))
+        stats += f'    {rate:,.0f} items/s'
+        if self.total and rate:
+            eta = max(0, self.total - count) / rate
+            stats += f'    ETA {timedelta(seconds=round(eta))}'
+        self.dialog.setLabelText(f'{self._label}\n{stats}')
+        QApplication.processEvents()
+
+
+def progress(
+    iterable: Iterable[T],
+    title: str = 'Progress',
+    total: O[int] = None,
+    label: str = None,
+    interval: float = 0.1,
+    parent: QWidget = None,
+    icon: QIcon = None,
+) -> ProgressDialog:
+    """-----
+    Wrap an iterable so that iterating over it shows a progress dialog with throughput and ETA
+
+    Parameters
+    ----------
+    iterable (Iterable): the items to iterate over
+
+    title (str, optional): [default="Progress"] the window title
+
+    total (int, optional): [default=None] the expected number of items. Defaults to len(<iterable>) if available
+
+    label (str, optional): [default=None] the text to show above the statistics. Defaults to <title>
+
+    interval (float, optional): [default=0.1] seconds between two repaints
+
+    parent (QWidget, optional): [default=None] the parent widget
+
+    icon (QIcon, optional): [default=None] an icon to set for the dialog window
+
+
+    Returns:
+    --------
+    ProgressDialog : an iterable yielding the items of <iterable>. Iteration stops early if the user presses <Cancel>
+    """
+
+    return ProgressDialog(iterable, title=title, total=total, label=label,
+                          interval=interval, parent=parent, icon=icon)
+
+
+def test():
+    from time import sleep
+
+    def slow(n):
+        for i in range(n):
+            if not i % 1000:
+                sleep(0.02)
+            yield i
+
+    total = 0
+    prog = progress(slow(200_000), title="Progress Test", total=200_000,
+                    label="Summing numbers...")
+    for i in prog:
+        total += i
+    print(f"summed {prog.count:,} numbers to {total:,}{' (canceled)' if prog.canceled else ''}")
+
+
+if __name__ == '__main__':
+    test()
@@ -0,0 +1,225 @@
+from tempfile import gettempdir
+from functools import lru_cache
+from hashlib import sha1
+from pathlib import Path
+from array import array
+from io import BytesIO
+import sys
+import wave
+import math
+
+from typing import (
+    Iterable,
+    Optional as O,
+    Union as U
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from .playsound import scheduler
+except ImportError:
+    from playsound import scheduler
+
+Envelope = tuple[float, float]
+"""(attack, release) in seconds"""
+Note = U[tuple[float, float], tuple[float, float, O[Envelope]]]
+"""(frequency in Hz, duration in seconds[, envelope]). A frequency of 0 is a rest"""
+
+RATE = 22050
+DEFAULT_ENVELOPE: Envelope = (0.005, 0.03)
+
+tones: dict[str, tuple[Note, ...]] = dict(
+    info=((880, 0.12), (1320, 0.25, (0.005, 0.2))),
+    warning=((660, 0.15), (0, 0.05), (660, 0.15), (0, 0.05), (880, 0.3, (0.005, 0.2))),
+    error=((440, 0.2), (349.23, 0.2), (261.63, 0.6, (0.005, 0.4))),
+)
+tonePriorities = dict(info=1, warning=2, error=3)
+
+
+def _normalize(notes: Iterable[Note]) -> tuple[tuple[float, float, float, float], ...]:
+    """hashable (frequency, duration, attack, release) tuples"""
+
+    out = list()
+    for note in notes:
+        freq, dur, *env = note
+        attack, release = (env[0] if env and env[0] is not None else DEFAULT_ENVELOPE)
+        out.append((float(freq), float(dur), float(attack), float(release)))
+    return tuple(out)
+
+
+def _renderNumpy(notes, rate: int, volume: float) -> bytes:
+    segments = list()
+    for freq, dur, attack, release in notes:
+        n = int(round(dur * rate))
+        if not freq:
+            segments.append(np.zeros(n))
+            continue
+        seg = np.sin((2 * np.pi * freq / rate) * np.arange(n))
+        a = min(n, int(attack * rate))
+        r = min(n - a, int(release * rate))
+        seg[:a] *= np.linspace(0, 1, a, endpoint=False)
+        seg[n - r:] *= np.linspace(1, 0, r)
+        segments.append(seg)
+    pcm = np.concatenate(segments) if segments else np.zeros(0)
+    return (pcm * (volume * 32767)).astype('<i2').tobytes()
+
+
+def _renderPython(notes, rate: int, volume: float) -> bytes:
+    pcm = array('h')
+    amp = volume * 32767
+    for freq, dur, attack, release in notes:
+        n = int(round(dur * rate))
+        if not freq:
+            pcm.extend(array('h', bytes(2 * n)))
+            continue
+        a = min(n, int(attack * rate))
+        r = min(n - a, int(release * rate))
+        w = 2 * math.pi * freq / rate
+        sin = math.sin
+        for i in range(n):
+            env = i / a if i < a else (n - 1 - i) / max(1, r - 1) if i >= n - r else 1.0
+            pcm.append(int(sin(w * i) * env * amp))
+    if sys.byteorder == 'big':
+        pcm.byteswap()
+    return pcm.tobytes()
+
+
+@lru_cache(maxsize=64)
+def _render(notes: tuple, rate: int, volume: float) -> bytes:
+    if np is not None:
+        return _renderNumpy(notes, rate, volume)
+    return _renderPython(notes, rate, volume)
+
+
+def _resolve(tone: U[str, Iterable[Note]]) -> tuple:
+    if isinstance(tone, str):
+        try:
+            return _normalize(tones[tone.lower()])
+        except KeyError:
+            raise ValueError(f'< tone > parameter must be one of {", ".join(map(repr, tones))}, '
+                             'or a sequence of (frequency, duration[, (attack, release)]) notes') from None
+    return _normalize(tone)
+
+
+def _volume(volume: float) -> float:
+    volume = float(volume)
+    # louder would overflow the 16-bit samples
+    if not 0 <= volume <= 1:
+        raise ValueError(f'< volume > parameter must be from 0 to 1, not {volume}')
+    return volume
+
+
+def synthesize(tone: U[str, Iterable[Note]], rate: int = RATE, volume: float = 0.5) -> bytes:
+    """-----
+    Render a tone as 16-bit mono PCM. Renders are cached by their parameters
+
+    Parameters
+    ----------
+    tone (str | Iterable[Note]): the name of a tone in <tones> ("info", "warning", "error"), or a sequence of \
+(frequency, duration[, (attack, release)]) notes. Frequencies are in Hz (0 for a rest), times in seconds
+
+    rate (int, optional): [default=22050] the sample rate
+
+    volume (float, optional): [default=0.5] the peak amplitude, from 0 to 1
+
+
+    Returns:
+    --------
+    bytes : little-endian 16-bit samples
+    """
+
+    return _render(_resolve(tone), int(rate), _volume(volume))
+
+
+@lru_cache(maxsize=64)
+def _wav(notes: tuple, rate: int, volume: float) -> bytes:
+    buf = BytesIO()
+    with wave.open(buf, 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(_render(notes, rate, volume))
+    return buf.getvalue()
+
+
+def wav(tone: U[str, Iterable[Note]], rate: int = RATE, volume: float = 0.5) -> bytes:
+    """-----
+    Render a tone as the contents of a .wav file, e.g. for winsound.PlaySound(data, winsound.SND_MEMORY). \
+Parameters are the same as <synthesize>
+
+
+    Returns:
+    --------
+    bytes : the .wav file
+    """
+
+    return _wav(_resolve(tone), int(rate), _volume(volume))
+
+
+@lru_cache(maxsize=64)
+def _wavFile(notes: tuple, rate: int, volume: float) -> Path:
+    key = sha1(repr((notes, rate, volume)).encode()).hexdigest()[:16]
+    path = Path(gettempdir()).joinpath(f'winnotify-tone-{key}.wav')
+    if not path.exists():
+        tmp = path.with_suffix(f'.{id(notes)}.tmp')
+        tmp.write_bytes(_wav(notes, rate, volume))
+        tmp.replace(path)
+    return path
+
+
+def wavFile(tone: U[str, Iterable[Note]], rate: int = RATE, volume: float = 0.5) -> Path:
+    """-----
+    Write a tone to a .wav file in the temp directory, once per set of parameters. Parameters are the same as <synthesize>
+
+
+    Returns:
+    --------
+    Path : the .wav file
+    """
+
+    return _wavFile(_resolve(tone), int(rate), _volume(volume))
+
+
+def PlayTone(tone: U[str, Iterable[Note]] = "info", priority: O[int] = None, volume: float = 0.5) -> bool:
+    """-----
+    Play a synthesized tone through the PlaySound scheduler
+
+    Parameters
+    ----------
+    tone (str | Iterable[Note], optional): [default="info"] One of "info", "warning", "error", or a sequence of \
+(frequency, duration[, (attack, release)]) notes
+
+    priority (int, optional): [default=None] The tone's priority. Defaults to 1, 2 and 3 for "info", "warning" and "error", so an error tone pre-empts "Exclamation"
+
+    volume (float, optional): [default=0.5] the peak amplitude, from 0 to 1
+
+
+    Returns:
+    --------
+    bool : False if the same tone was requested too recently and suppressed, or dropped from a full queue, otherwise True
+    """
+
+    path = wavFile(tone, volume=volume)
+    if priority is None and isinstance(tone, str):
+        priority = tonePriorities.get(tone.lower())
+    return scheduler.submit(f'tone:{path.stem}',
+                            f'(new-object Media.SoundPlayer "{path}").playsync()',
+                            priority)
+
+
+def test():
+    from time import sleep
+
+    for name in tones:
+        PlayTone(name)
+        sleep(1.5)
+    PlayTone([(523.25, 0.15), (659.25, 0.15), (783.99, 0.15), (1046.5, 0.4, (0.005, 0.3))])
+    sleep(1.5)
+
+
+if __name__ == "__main__":
+    test()
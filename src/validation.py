@@ -0,0 +1,426 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import OrderedDict
+from inspect import iscoroutinefunction
+from threading import Lock
+import asyncio
+import re
+
+from PyQt5.QtCore import (
+    pyqtSignal,
+    QObject,
+    QTimer
+)
+from PyQt5.QtWidgets import (
+    QDoubleSpinBox,
+    QPushButton,
+    QComboBox,
+    QLineEdit,
+    QCheckBox,
+    QSpinBox,
+    QWidget,
+    QLabel
+)
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Optional as O,
+    Union as U
+)
+
+_executor: O[ThreadPoolExecutor] = None
+
+
+def executor() -> ThreadPoolExecutor:
+    """the thread pool shared by threaded validators"""
+
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='winnotify')
+    return _executor
+
+
+class Validator:
+    """Base class for a field validator. Results are cached per value
+
+    A threaded validator is called from the shared pool while the GUI thread reads its cache, and may be asked about \
+several fields at once: the cache is guarded by a lock, and checks run one at a time"""
+
+    message: str
+    threaded: bool = False
+    cacheSize: int = 256
+    _cache: OrderedDict
+
+    def __init__(self, message: str):
+        self.message = message
+        self._cache = OrderedDict()
+        self._lock = Lock()
+        self._checking = Lock()
+
+    def _check(self, value: Any) -> U[bool, str]:
+        """return True if <value> is valid, otherwise False or an error message"""
+        raise NotImplementedError
+
+    def cached(self, value: Any) -> tuple[bool, O[str]]:
+        """(hit, error) for <value> without running the check"""
+
+        with self._lock:
+            try:
+                error = self._cache[value]
+                self._cache.move_to_end(value)
+            except (KeyError, TypeError):
+                return False, None
+        return True, error
+
+    def __call__(self, value: Any) -> O[str]:
+        """the error message for <value>, or None if it is valid"""
+
+        hit, error = self.cached(value)
+        if hit:
+            return error
+        with self._checking:
+            # another field may have checked the same value while this one waited
+            hit, error = self.cached(value)
+            if hit:
+                return error
+            try:
+                result = self._check(value)
+            except Exception as e:
+                result = str(e) or type(e).__name__
+        error = None if result is True else result if isinstance(result, str) else self.message
+        with self._lock:
+            try:
+                self._cache[value] = error
+            except TypeError:
+                return error
+            if len(self._cache) > self.cacheSize:
+                self._cache.popitem(last=False)
+        return error
+
+
+class RegexValidator(Validator):
+    """the whole value must match a regular expression, compiled once"""
+
+    def __init__(self, pattern: U[str, re.Pattern], message: str = None, flags: int = 0):
+        super().__init__(message or f'must match {getattr(pattern, "pattern", pattern)!r}')
+        self.pattern = re.compile(pattern, flags)
+
+    def _check(self, value: Any) -> bool:
+        return self.pattern.fullmatch(str(value)) is not None
+
+
+class RangeValidator(Validator):
+    """the value (or its length, if it is a str that is not a number) must be within [<min>, <max>]"""
+
+    def __init__(self, min: O[float] = None, max: O[float] = None, message: str = None):
+        if message is None:
+            message = (f'must be between {min} and {max}' if None not in (min, max)
+                       else f'must be at least {min}' if max is None else f'must be at most {max}')
+        super().__init__(message)
+        self.min = min
+        self.max = max
+
+    def _check(self, value: Any) -> bool:
+        if isinstance(value, str):
+            try:
+                value = float(value)
+            except ValueError:
+                value = len(value)
+        return ((self.min is None or value >= self.min)
+                and (self.max is None or value <= self.max))
+
+
+class CallableValidator(Validator):
+    """a callable or coroutine function returning True, False or an error message. \
+If <threaded> (always for coroutine functions) it runs in a thread pool and never blocks typing"""
+
+    def __init__(self, func: Callable[[Any], Any], message: str = 'invalid value', threaded: bool = False):
+        super().__init__(message)
+        self.func = func
+        self.threaded = threaded or iscoroutinefunction(func)
+
+    def _check(self, value: Any) -> U[bool, str]:
+        if iscoroutinefunction(self.func):
+            return asyncio.run(self.func(value))
+        return self.func(value)
+
+
+class Rule:
+    """a cross-field rule. <func> is called with the values of <labels> and returns True, False or an error message"""
+
+    def __init__(self, labels: Iterable[str], func: Callable[..., U[bool, str]], message: str = 'invalid combination'):
+        self.labels = tuple(labels)
+        self.func = func
+        self.message = message
+
+    def __call__(self, values: dict[str, Any]) -> O[str]:
+        try:
+            result = self.func(*(values[lbl] for lbl in self.labels))
+        except Exception as e:
+            result = str(e) or type(e).__name__
+        return None if result is True else result if isinstance(result, str) else self.message
+
+
+class Validate:
+    """Builder class for validators. Available methods are regex, range, check, or rule"""
+
+    def regex(pattern: U[str, re.Pattern], message: str = None, flags: int = 0) -> RegexValidator:
+        """-----
+        Require the whole value to match a regular expression
+
+        Parameters
+        ----------
+        pattern (str | re.Pattern): the regular expression. It is compiled once
+
+        message (str, optional): [default=None] the error to show. Defaults to a description of the pattern
+
+        flags (int, optional): [default=0] re flags
+
+
+        Returns:
+        --------
+        RegexValidator : the validator
+        """
+
+        return RegexValidator(pattern, message, flags)
+
+    def range(min: O[float] = None, max: O[float] = None, message: str = None) -> RangeValidator:
+        """-----
+        Require a number (or a text's length) to be within bounds
+
+        Parameters
+        ----------
+        min (float, optional): [default=None] the minimum value. None for no minimum
+
+        max (float, optional): [default=None] the maximum value. None for no maximum
+
+        message (str, optional): [default=None] the error to show. Defaults to a description of the bounds
+
+
+        Returns:
+        --------
+        RangeValidator : the validator
+        """
+
+        return RangeValidator(min, max, message)
+
+    def check(func: Callable[[Any], Any], message: str = 'invalid value', threaded: bool = False) -> CallableValidator:
+        """-----
+        Validate with a callable or coroutine function
+
+        Parameters
+        ----------
+        func (callable): called with the value. Returns True, False, or an error message
+
+        message (str, optional): [default="invalid value"] the error to show when <func> returns False
+
+        threaded (bool, optional): [default=False] run <func> in a thread pool. Use this for slow checks (e.g. a path on a network share). Coroutine functions are always threaded
+
+
+        Returns:
+        --------
+        CallableValidator : the validator
+        """
+
+        return CallableValidator(func, message, threaded)
+
+    def rule(labels: Iterable[str], func: Callable[..., U[bool, str]], message: str = 'invalid combination') -> Rule:
+        """-----
+        Validate several fields together
+
+        Parameters
+        ----------
+        labels (Iterable[str]): the labels of the fields to pass to <func>, in order
+
+        func (callable): called with the fields' values. Returns True, False, or an error message
+
+        message (str, optional): [default="invalid combination"] the error to show when <func> returns False
+
+
+        Returns:
+        --------
+        Rule : the rule
+        """
+
+        return Rule(labels, func, message)
+
+
+def widgetValue(wgt: QWidget) -> U[str, int, float, bool]:
+    """the current value of an input widget"""
+
+    if isinstance(wgt, QLineEdit):
+        return wgt.text()
+    if isinstance(wgt, QComboBox):
+        return wgt.currentText()
+    if isinstance(wgt, (QSpinBox, QDoubleSpinBox)):
+        return wgt.value()
+    if isinstance(wgt, QCheckBox):
+        return wgt.isChecked()
+    return "ERROR"
+
+
+def setWidgetValue(wgt: QWidget, value: U[str, int, float, bool]) -> None:
+    """set the current value of an input widget"""
+
+    if isinstance(wgt, QLineEdit):
+        wgt.setText(str(value))
+    elif isinstance(wgt, QComboBox):
+        wgt.setCurrentText(str(value))
+    elif isinstance(wgt, (QSpinBox, QDoubleSpinBox)):
+        wgt.setValue(value)
+    elif isinstance(wgt, QCheckBox):
+        wgt.setChecked(bool(value))
+
+
+def _changedSignal(wgt: QWidget):
+    if isinstance(wgt, QLineEdit):
+        return wgt.textChanged
+    if isinstance(wgt, QComboBox):
+        return wgt.currentTextChanged
+    if isinstance(wgt, (QSpinBox, QDoubleSpinBox)):
+        return wgt.valueChanged
+    if isinstance(wgt, QCheckBox):
+        return wgt.toggled
+    return None
+
+
+class FormValidator(QObject):
+    """-----
+    Validates a form's fields as they are edited
+
+    Each field is validated <delay> ms after its last edit. Regex, range and other quick validators run on the GUI \
+thread; threaded validators run in a thread pool and their results are dropped if the field was edited again meanwhile. \
+The <ok> button is only enabled while every field and rule is valid
+    """
+
+    errors: dict[str, str]
+    ruleErrors: dict[Rule, str]
+    _finished = pyqtSignal(object, int, object)
+
+    def __init__(self, fields: dict[str, QWidget], validators: dict[str, U[Validator, list[Validator]]],
+                 rules: list[Rule], ok: QPushButton, status: QLabel, delay: int = 250):
+        super().__init__(ok)
+        self.fields = fields
+        self.validators = {lbl: [v] if isinstance(v, Validator) else list(v)
+                           for lbl, v in (validators or dict()).items()}
+        self.rules = list(rules or ())
+        self.errors = dict()
+        self.ruleErrors = dict()
+        self._ok = ok
+        self._status = status
+        self._pending: dict[str, int] = dict()
+        self._generation: dict[str, int] = dict()
+        self._futures: dict[str, Future] = dict()
+        self._timers: dict[str, QTimer] = dict()
+        self._finished.connect(self._onFinished)
+        for lbl in set(self.validators) | {lbl for rule in self.rules for lbl in rule.labels}:
+            wgt = fields.get(lbl)
+            signal = _changedSignal(wgt)
+            if signal is None:
+                raise ValueError(f'no input field labeled {lbl!r} to validate')
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.setInterval(delay)
+            timer.timeout.connect(lambda lbl=lbl: self._validate(lbl))
+            self._timers[lbl] = timer
+            self._generation[lbl] = 0
+            signal.connect(lambda *_, lbl=lbl: self._edited(lbl))
+        for lbl in self._timers:
+            self._validate(lbl)
+
+    @property
+    def valid(self) -> bool:
+        return not (self._pending or self.errors or self.ruleErrors)
+
+    def validateNow(self) -> bool:
+        """validate every field immediately, running threaded validators on this thread, and return <valid>"""
+
+        for lbl, timer in self._timers.items():
+            timer.stop()
+            future = self._futures.pop(lbl, None)
+            if future is not None:
+                future.cancel()
+            self._generation[lbl] += 1
+            value = widgetValue(self.fields[lbl])
+            error = next((err for err in (v(value) for v in self.validators.get(lbl, ()))
+                          if err is not None), None)
+            self._onFinished(lbl, self._generation[lbl], error)
+        return self.valid
+
+    def _edited(self, lbl: str):
+        self._generation[lbl] += 1
+        self._pending[lbl] = self._generation[lbl]
+        future = self._futures.pop(lbl, None)
+        if future is not None:
+            future.cancel()
+        self._ok.setEnabled(False)
+        self._timers[lbl].start()
+
+    def _validate(self, lbl: str):
+        gen = self._generation[lbl]
+        value = widgetValue(self.fields[lbl])
+        threaded = list()
+        for validator in self.validators.get(lbl, ()):
+            if validator.threaded:
+                hit, error = validator.cached(value)
+                if not hit:
+                    threaded.append(validator)
+                    continue
+            else:
+                error = validator(value)
+            if error is not None:
+                return self._onFinished(lbl, gen, error)
+        if not threaded:
+            return self._onFinished(lbl, gen, None)
+        self._pending[lbl] = gen
+        self._update()
+
+        def work():
+            for validator in threaded:
+                error = validator(value)
+                if error is not None:
+                    return error
+            return None
+        future = executor().submit(work)
+        self._futures[lbl] = future
+        future.add_done_callback(lambda f: f.cancelled() or self._finished.emit(lbl, gen, f.result()))
+
+    def _onFinished(self, lbl: str, gen: int, error: O[str]):
+        if gen != self._generation[lbl]:
+            return
+        self._pending.pop(lbl, None)
+        self._futures.pop(lbl, None)
+        if error is None:
+            self.errors.pop(lbl, None)
+        else:
+            self.errors[lbl] = error
+        self._checkRules()
+        self._update()
+
+    def _checkRules(self):
+        values = {lbl: widgetValue(wgt) for lbl, wgt in self.fields.items()}
+        for rule in self.rules:
+            if any(lbl in self.errors or lbl in self._pending for lbl in rule.labels):
+                self.ruleErrors.pop(rule, None)
+                continue
+            error = rule(values)
+            if error is None:
+                self.ruleErrors.pop(rule, None)
+            else:
+                self.ruleErrors[rule] = error
+
+    def _update(self):
+        for lbl in self._timers:
+            wgt = self.fields[lbl]
+            error = self.errors.get(lbl)
+            wgt.setToolTip(error or '')
+            wgt.setProperty('invalid', error is not None)
+            wgt.style().unpolish(wgt)
+            wgt.style().polish(wgt)
+        messages = [f'{lbl}: {err}' for lbl, err in self.errors.items()]
+        messages += list(self.ruleErrors.values())
+        if not messages and self._pending:
+            messages = ['checking…']
+        self._status.setText('\n'.join(messages))
+        self._status.setVisible(bool(messages))
+        self._ok.setEnabled(self.valid)
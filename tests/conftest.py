@@ -0,0 +1,153 @@
+"""Stand-ins for pywin32 (recording) and PyQt5 (inert), so the package can be exercised on any platform"""
+import importlib.util
+import subprocess
+import os
+import threading
+import types
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).parent.parent.joinpath('src')
+
+
+class Win32Recorder:
+    """records every win32gui call as (name, args)"""
+
+    def __init__(self):
+        self.calls = list()
+        self.events = dict()
+
+    def named(self, name):
+        return [args for n, args in self.calls if n == name]
+
+    def modules(self):
+        gui = types.ModuleType('win32gui')
+        con = types.ModuleType('win32con')
+        pwt = types.ModuleType('pywintypes')
+        ev = types.ModuleType('win32event')
+        pwt.HANDLE = int
+        pwt.error = OSError
+        for i, name in enumerate(['NIIF_INFO', 'NIIF_WARNING', 'NIIF_ERROR', 'NIIF_NOSOUND', 'NIF_ICON',
+                                  'NIF_MESSAGE', 'NIF_TIP', 'NIF_INFO', 'NIM_ADD', 'NIM_MODIFY', 'NIM_DELETE']):
+            setattr(gui, name, 1 << i)
+        for name, value in dict(WM_DESTROY=2, WM_USER=0x400, IMAGE_ICON=1, LR_LOADFROMFILE=16, LR_DEFAULTSIZE=64,
+                                IDI_APPLICATION=32512, WS_OVERLAPPED=0, WS_SYSMENU=0x80000, CW_USEDEFAULT=-1,
+                                WM_LBUTTONUP=0x202).items():
+            setattr(con, name, value)
+        gui.WNDCLASS = type('WNDCLASS', (), {})
+
+        def record(name, ret=None):
+            def func(*args):
+                self.calls.append((name, args))
+                return ret
+            return func
+        for name in ['GetModuleHandle', 'UpdateWindow', 'DestroyWindow', 'UnregisterClass', 'PostQuitMessage',
+                     'LoadImage', 'LoadIcon', 'Shell_NotifyIcon']:
+            setattr(gui, name, record(name, 1))
+        gui.RegisterClass = record('RegisterClass', 7)
+        gui.CreateWindow = record('CreateWindow', 99)
+        gui.PumpWaitingMessages = lambda: 0
+
+        ev.INFINITE = 0xFFFFFFFF
+        ev.QS_ALLINPUT = 0x4FF
+
+        def CreateEvent(*_):
+            handle = len(self.events) + 1
+            self.events[handle] = threading.Event()
+            return handle
+
+        def MsgWaitForMultipleObjects(handles, _, ms, __):
+            event = self.events[handles[0]]
+            event.wait(None if ms == ev.INFINITE else ms / 1000)
+            event.clear()
+        ev.CreateEvent = CreateEvent
+        ev.SetEvent = lambda handle: self.events[handle].set()
+        ev.MsgWaitForMultipleObjects = MsgWaitForMultipleObjects
+        return {'win32gui': gui, 'win32con': con, 'pywintypes': pwt, 'win32event': ev}
+
+
+class _Inert:
+    """accepts any arguments and attribute access, and returns more of itself"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        return _Inert()
+
+    def __call__(self, *args, **kwargs):
+        return _Inert()
+
+    def __or__(self, other):
+        return self
+
+    def __bool__(self):
+        return False
+
+
+class _InertType(type):
+    def __getattr__(cls, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return _Inert()
+
+
+class _InertModule(types.ModuleType):
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return _InertType(name, (_Inert,), {})
+
+
+def qtModules():
+    """inert PyQt5 modules: every name is a class that accepts anything, enough to import the package"""
+    return {name: _InertModule(name) for name in ('PyQt5', 'PyQt5.QtCore', 'PyQt5.QtGui', 'PyQt5.QtWidgets')}
+
+
+@pytest.fixture
+def cli(tmp_path):
+    """run python -m winnotify.<module> in <tmp_path>, with the stand-ins installed by a sitecustomize"""
+
+    tmp_path.joinpath('winnotify').symlink_to(SRC.parent, target_is_directory=True)
+    tmp_path.joinpath('sitecustomize.py').write_text(
+        'import subprocess, sys\n'
+        f'sys.path.insert(0, {str(Path(__file__).parent)!r})\n'
+        'from conftest import Win32Recorder, qtModules\n'
+        'sys.modules.update(Win32Recorder().modules())\n'
+        'sys.modules.update(qtModules())\n'
+        'subprocess.CREATE_NO_WINDOW = 0x08000000\n'
+        'subprocess.CREATE_NEW_CONSOLE = 16\n')
+
+    def run(module, *args):
+        return subprocess.run([sys.executable, '-m', f'winnotify.{module}', *map(str, args)], cwd=tmp_path,
+                              env=dict(os.environ, PYTHONPATH=str(tmp_path)), capture_output=True, text=True,
+                              timeout=60)
+    return run
+
+
+@pytest.fixture
+def win32(monkeypatch):
+    """a Win32Recorder installed in place of pywin32, and a loader for the modules in src that need it"""
+
+    rec = Win32Recorder()
+    for name, module in rec.modules().items():
+        monkeypatch.setitem(sys.modules, name, module)
+    monkeypatch.setattr(subprocess, 'CREATE_NEW_CONSOLE', 16, raising=False)
+    monkeypatch.setattr(subprocess, 'CREATE_NO_WINDOW', 0x08000000, raising=False)
+    # a bare package, so src/__init__ (which needs PyQt5) is not imported
+    pkg = types.ModuleType('winnotify_src')
+    pkg.__path__ = [str(SRC)]
+    monkeypatch.setitem(sys.modules, 'winnotify_src', pkg)
+
+    def load(name):
+        full = f'winnotify_src.{name}'
+        if full not in sys.modules:
+            spec = importlib.util.spec_from_file_location(full, SRC.joinpath(f'{name}.py'))
+            module = importlib.util.module_from_spec(spec)
+            monkeypatch.setitem(sys.modules, full, module)
+            spec.loader.exec_module(module)
+        return sys.modules[full]
+    rec.load = load
+    return rec
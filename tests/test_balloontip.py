@@ -0,0 +1,41 @@
+from time import perf_counter, sleep
+
+
+def test_progress_coalesces_updates(win32):
+    ProgressBalloontip = win32.load('balloontip').ProgressBalloontip
+    total = 100_000
+    prog = ProgressBalloontip('Job', '0', interval=0.05)
+    start = perf_counter()
+    for i in range(1, total + 1):
+        prog.update(f'{i}/{total}')
+    elapsed = perf_counter() - start
+    sleep(0.15)
+    prog.close('done', timeout=0)
+
+    gui = win32.modules()['win32gui']
+    sent = [(args[0], args[1][6]) for args in win32.named('Shell_NotifyIcon')]
+    assert prog.updates == total + 1
+    assert sent[0] == (gui.NIM_ADD, '0')
+    assert (gui.NIM_MODIFY, f'{total}/{total}') in sent
+    assert sent[-1] == (gui.NIM_MODIFY, 'done')
+    # 100k updates are coalesced into a handful of NIM_MODIFY calls
+    assert prog.sent <= 5
+    assert elapsed < 1.0
+
+
+def test_progress_close_without_change_does_not_resend(win32):
+    ProgressBalloontip = win32.load('balloontip').ProgressBalloontip
+    prog = ProgressBalloontip('Job', 'step', interval=0.05)
+    start = perf_counter()
+    prog.close(timeout=5)
+    assert perf_counter() - start < 1
+    assert prog.sent == 0
+    assert win32.named('DestroyWindow')
+
+
+def test_invalid_timeout_is_logged_not_blocking(win32):
+    CreateBalloontip = win32.load('balloontip').CreateBalloontip
+    before = CreateBalloontip.errors['ValueError']
+    CreateBalloontip('t', 'm', timeout=0)
+    assert CreateBalloontip.errors['ValueError'] == before + 1
+    assert not win32.named('RegisterClass')
@@ -0,0 +1,37 @@
+import json
+
+SCRIPT = '''
+from time import monotonic
+from winnotify.src.driver import runDialog
+
+
+class Question:
+    out = None
+
+    def __init__(self, title, answer=None):
+        runDialog(self, 'messagebox', dict(title=title), lambda: setattr(self, 'out', answer), monotonic())
+
+    def _replay(self, answer):
+        self.out = answer
+
+
+print(Question('Continue?', {answer!r}).out)
+'''
+
+
+def test_cli_records_and_replays(cli, tmp_path):
+    script = tmp_path.joinpath('script.py')
+    script.write_text(SCRIPT.format(answer='yes'))
+    recorded = cli('src.driver', 'record', 'trace.jsonl', script)
+    assert recorded.returncode == 0, recorded.stderr
+    assert recorded.stdout == 'yes\n'
+    assert recorded.stderr.startswith('1 dialogs')
+    entries = [json.loads(line) for line in tmp_path.joinpath('trace.jsonl').read_text().splitlines()]
+    assert [entry.get('answer') for entry in entries] == [None, 'yes']
+
+    # the script no longer answers by itself, so every answer comes from the trace
+    script.write_text(SCRIPT.format(answer=None))
+    replayed = cli('src.driver', 'replay', '--speed', 'max', '--repeat', 3, 'trace.jsonl', script)
+    assert replayed.returncode == 0, replayed.stderr
+    assert replayed.stdout == 'yes\n' * 3
+    assert replayed.stderr.startswith('3 dialogs')
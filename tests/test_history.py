@@ -0,0 +1,83 @@
+from threading import Thread
+
+
+def test_answers_with_non_str_keys_are_recorded(win32):
+    history = win32.load('history')
+    hist = history.History()
+    entry = hist.record('inputdialog', 'title', ['a'], {(1, 2): 'x', 3: [{'y': 4}]})
+    assert entry.answer == '{"(1, 2)": "x", "3": [{"y": 4}]}'
+
+
+def test_record_never_raises(win32, monkeypatch):
+    history = win32.load('history')
+    hist = history.History()
+    monkeypatch.setattr(history, 'time', lambda: 1 / 0)
+    assert hist.record('messagebox', 'title') is None
+
+
+def test_writers_sharing_a_directory(win32, tmp_path, monkeypatch):
+    history = win32.load('history')
+    hists = [history.History(tmp_path), history.History(tmp_path)]
+    clock = iter(range(10_000, 0, -1))
+    monkeypatch.setattr(history, 'time', lambda: next(clock))
+
+    def record(n, hist):
+        for i in range(500):
+            hist.record('messagebox', f'writer {n} title {i}', f'writer {n} message {i}')
+
+    threads = [Thread(target=record, args=(n, hist)) for n, hist in enumerate(hists)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for hist in hists:
+        hist.close()
+    entries = history.HistoryReader(tmp_path).tail(1000)
+    assert len(entries) == 1000
+    for entry in entries:
+        assert entry.message == entry.title.replace('title', 'message')
+    times = [entry.time for entry in entries]
+    assert times == sorted(times)
+
+
+def test_query_limit_decodes_only_the_returned_entries(win32, tmp_path, monkeypatch):
+    history = win32.load('history')
+    hist = history.History(tmp_path)
+    for i in range(5000):
+        hist.record('messagebox' if i % 2 else 'balloontip', f'Job {i % 7}', f'step {i}')
+    reader = hist.reader()
+    hist.close()
+    decoded = list()
+    string = reader._string
+    monkeypatch.setattr(reader, '_string', lambda sid: decoded.append(sid) or string(sid))
+    for kwargs in (dict(), dict(kind='messagebox'), dict(title='job 3', contains=True)):
+        newest = reader.query(**kwargs)[-5:]
+        decoded.clear()
+        assert reader.query(limit=5, **kwargs) == newest
+        assert len(decoded) < 50
+
+
+def test_writer_error_does_not_block_flush(win32, tmp_path, monkeypatch):
+    history = win32.load('history')
+
+    def fail(entry, recs, strs, intern):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(history.History, '_writeBatch', staticmethod(fail))
+    hist = history.History(tmp_path)
+    hist.record('messagebox', 'first')
+    assert len(hist.reader()) == 0
+    hist.record('messagebox', 'second')
+    hist.flush()
+    assert hist._queue.unfinished_tasks == 0
+    hist.close()
+
+
+def test_unwritable_directory_does_not_block_flush(win32, tmp_path):
+    history = win32.load('history')
+    tmp_path.joinpath('history.lock').mkdir()
+    hist = history.History(tmp_path)
+    hist.record('messagebox', 'title')
+    hist.flush()
+    hist.close()
+    assert [entry.title for entry in hist.recent] == ['title']
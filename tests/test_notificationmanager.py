@@ -0,0 +1,42 @@
+from time import sleep
+
+import pytest
+
+
+def test_failing_callback_with_raise_policy_keeps_loop_alive(win32):
+    NotificationManager = win32.load('notificationmanager').NotificationManager
+    expired = list()
+
+    def fail(ntf):
+        raise RuntimeError('callback failed')
+
+    with NotificationManager(onerror='raise') as manager:
+        manager.notify('first', 'm', timeout=0.05, ontimeout=fail)
+        sleep(0.2)
+        assert manager._thread.is_alive()
+        manager.notify('second', 'm', timeout=0.05, ontimeout=expired.append)
+        sleep(0.2)
+    assert [ntf.title for ntf in expired] == ['second']
+
+
+def test_expiry_order(win32):
+    NotificationManager = win32.load('notificationmanager').NotificationManager
+    expired = list()
+    with NotificationManager() as manager:
+        for i, timeout in enumerate([0.3, 0.1, 0.2]):
+            manager.notify(str(i), 'm', timeout=timeout, ontimeout=lambda n: expired.append(n.title))
+        sleep(0.5)
+        assert not manager.live
+    assert expired == ['1', '2', '0']
+
+
+def test_window_setup_error_is_raised_from_init(win32, monkeypatch):
+    module = win32.load('notificationmanager')
+
+    def fail(*args):
+        raise OSError('CreateWindow failed')
+
+    monkeypatch.setattr(module.gui32, 'CreateWindow', fail)
+    with pytest.raises(OSError, match='CreateWindow failed'):
+        module.NotificationManager()
+    assert win32.named('UnregisterClass')
@@ -0,0 +1,49 @@
+class Voice:
+    def __init__(self):
+        self.done = False
+
+    def poll(self):
+        return 0 if self.done else None
+
+    def kill(self):
+        self.done = True
+
+
+def scheduler(win32, now):
+    SoundScheduler = win32.load('playsound').SoundScheduler
+    return SoundScheduler(backend=lambda cmd: Voice(), clock=lambda: now[0], window=0.5, autopump=False)
+
+
+def test_suppression_window_starts_at_last_accepted_sound(win32):
+    now = [0.0]
+    sched = scheduler(win32, now)
+    accepted = list()
+    for _ in range(5):
+        accepted.append(sched.submit('Beep', 'beep'))
+        now[0] += 0.3
+    # a request every 0.3s must not keep the window open forever
+    assert accepted == [True, False, True, False, True]
+    assert sched.stats['suppressed'] == 2
+
+
+def test_system_sounds_play_synchronously(win32, monkeypatch):
+    playsound = win32.load('playsound')
+    cmds = list()
+    monkeypatch.setattr(playsound.scheduler, 'submit', lambda key, cmd, priority: cmds.append(cmd))
+    playsound.PlaySound('hand')
+    assert 'SystemHand' in cmds[0] and cmds[0].endswith('.playsync() }')
+
+
+def test_dropped_sound_is_reported_and_not_suppressed(win32):
+    now = [0.0]
+    sched = scheduler(win32, now)
+    sched.maxVoices = sched.maxQueue = 1
+    assert sched.submit('Hand', 'hand', 3)
+    assert sched.submit('Exclamation', 'exclamation', 2)
+    # the queue is full of a higher priority sound
+    assert not sched.submit('Beep', 'beep', 0)
+    assert sched.stats['dropped'] == 1
+    sched._voices[0][3].done = True
+    sched.pump()
+    assert sched.submit('Beep', 'beep', 0)
+    assert sched.stats['suppressed'] == 0
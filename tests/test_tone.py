@@ -0,0 +1,15 @@
+import pytest
+
+
+def test_full_volume_renders_the_same_on_both_paths(win32):
+    tone = win32.load('tone')
+    notes = tone._resolve('error')
+    assert tone.synthesize('error', volume=1) == tone._renderPython(notes, tone.RATE, 1.0)
+
+
+@pytest.mark.parametrize('volume', [-0.1, 1.5])
+def test_volume_out_of_range_is_rejected(win32, volume):
+    tone = win32.load('tone')
+    for func in (tone.synthesize, tone.wav, tone.wavFile, tone.PlayTone):
+        with pytest.raises(ValueError, match='volume'):
+            func('info', volume=volume)